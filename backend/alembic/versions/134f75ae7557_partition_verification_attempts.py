@@ -0,0 +1,99 @@
+"""partition verification_attempts by month
+
+Revision ID: 134f75ae7557
+Revises: 3c851241f5ae
+Create Date: 2026-10-18 11:02:47.903152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '134f75ae7557'
+down_revision: Union[str, None] = '3c851241f5ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created ahead of the current month; afterwards
+# `python -m src.commands.partitions ensure` keeps this window open.
+MONTHS_AHEAD = 3
+
+
+def _create_attempts_table(partitioned: bool) -> None:
+    op.execute(
+        f"""
+        CREATE TABLE verification_attempts (
+            id UUID NOT NULL,
+            app_id UUID NOT NULL,
+            kind VARCHAR(20) NOT NULL,
+            success BOOLEAN NOT NULL,
+            payload JSONB NOT NULL,
+            message TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT verification_attempts_pkey PRIMARY KEY ({'id, created_at' if partitioned else 'id'}),
+            CONSTRAINT verification_attempts_app_id_fkey FOREIGN KEY (app_id) REFERENCES udyam_applications (id)
+        ){' PARTITION BY RANGE (created_at)' if partitioned else ''}
+        """
+    )
+    op.create_index('ix_verification_attempts_app_id_created_at_id', 'verification_attempts', ['app_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_verification_attempts_kind', 'verification_attempts', ['kind'], unique=False)
+
+
+def _rename_to_legacy() -> None:
+    # Index-backed names are schema-wide, so free them for the new table.
+    op.rename_table('verification_attempts', 'verification_attempts_legacy')
+    op.execute('ALTER TABLE verification_attempts_legacy RENAME CONSTRAINT verification_attempts_pkey TO verification_attempts_legacy_pkey')
+    op.execute('ALTER INDEX ix_verification_attempts_app_id_created_at_id RENAME TO ix_verification_attempts_legacy_app_id_created_at_id')
+    op.execute('ALTER INDEX ix_verification_attempts_kind RENAME TO ix_verification_attempts_legacy_kind')
+
+
+def upgrade() -> None:
+    _rename_to_legacy()
+    _create_attempts_table(partitioned=True)
+
+    # One partition per month from the oldest existing row up to
+    # MONTHS_AHEAD months out, plus a default partition so an insert
+    # outside that window never fails.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start DATE := date_trunc('month', COALESCE(
+                (SELECT min(created_at) FROM verification_attempts_legacy), now()
+            ))::date;
+            last_month DATE := (date_trunc('month', now()) + interval '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF verification_attempts FOR VALUES FROM (%L) TO (%L)',
+                    'verification_attempts_p' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute('CREATE TABLE verification_attempts_default PARTITION OF verification_attempts DEFAULT')
+
+    op.execute(
+        'INSERT INTO verification_attempts (id, app_id, kind, success, payload, message, created_at) '
+        'SELECT id, app_id, kind, success, payload, message, created_at FROM verification_attempts_legacy'
+    )
+    op.drop_table('verification_attempts_legacy')
+
+
+def downgrade() -> None:
+    _rename_to_legacy()
+    _create_attempts_table(partitioned=False)
+    op.execute(
+        'INSERT INTO verification_attempts (id, app_id, kind, success, payload, message, created_at) '
+        'SELECT id, app_id, kind, success, payload, message, created_at FROM verification_attempts_legacy'
+    )
+    # Dropping the partitioned parent drops every attached partition with it.
+    op.drop_table('verification_attempts_legacy')
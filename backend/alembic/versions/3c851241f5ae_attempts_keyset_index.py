@@ -0,0 +1,29 @@
+"""attempts keyset index
+
+Revision ID: 3c851241f5ae
+Revises: 1e14e3ad4046
+Create Date: 2026-10-18 10:12:31.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c851241f5ae'
+down_revision: Union[str, None] = '1e14e3ad4046'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite index leads with app_id, so it also serves plain app_id lookups.
+    op.create_index('ix_verification_attempts_app_id_created_at_id', 'verification_attempts', ['app_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_verification_attempts_app_id', table_name='verification_attempts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_verification_attempts_app_id', 'verification_attempts', ['app_id'], unique=False)
+    op.drop_index('ix_verification_attempts_app_id_created_at_id', table_name='verification_attempts')
@@ -0,0 +1,31 @@
+"""application listing indexes
+
+Revision ID: 83a0e2adc63c
+Revises: 6b452312762d
+Create Date: 2026-10-18 12:58:13.570412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '83a0e2adc63c'
+down_revision: Union[str, None] = '6b452312762d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_udyam_applications_created_at_id', 'udyam_applications', ['created_at', 'id'], unique=False)
+    # Leads with status, so it also covers the old single-column status index.
+    op.create_index('ix_udyam_applications_status_created_at_id', 'udyam_applications', ['status', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_udyam_applications_status', table_name='udyam_applications')
+
+
+def downgrade() -> None:
+    op.create_index('ix_udyam_applications_status', 'udyam_applications', ['status'], unique=False)
+    op.drop_index('ix_udyam_applications_status_created_at_id', table_name='udyam_applications')
+    op.drop_index('ix_udyam_applications_created_at_id', table_name='udyam_applications')
@@ -0,0 +1,30 @@
+"""pending idempotency keys
+
+Revision ID: a7d51c0e94b2
+Revises: 8c23dac92758
+Create Date: 2026-10-18 14:37:05.126834
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d51c0e94b2'
+down_revision: Union[str, None] = '8c23dac92758'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A claimed key has no response until its request finishes.
+    op.alter_column('idempotency_keys', 'status_code', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('idempotency_keys', 'response_body', existing_type=postgresql.BYTEA(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute('DELETE FROM idempotency_keys WHERE status_code IS NULL OR response_body IS NULL')
+    op.alter_column('idempotency_keys', 'response_body', existing_type=postgresql.BYTEA(), nullable=False)
+    op.alter_column('idempotency_keys', 'status_code', existing_type=sa.Integer(), nullable=False)
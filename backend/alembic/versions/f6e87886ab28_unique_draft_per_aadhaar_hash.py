@@ -0,0 +1,42 @@
+"""unique draft per aadhaar_hash
+
+Revision ID: f6e87886ab28
+Revises: 134f75ae7557
+Create Date: 2026-10-18 11:48:09.221376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6e87886ab28'
+down_revision: Union[str, None] = '134f75ae7557'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the most recently touched draft per Aadhaar; older duplicates
+    # left behind by repeated send-otp calls are marked superseded.
+    op.execute(
+        """
+        UPDATE udyam_applications AS app
+        SET status = 'superseded'
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY aadhaar_hash ORDER BY updated_at DESC, created_at DESC, id DESC
+            ) AS rank
+            FROM udyam_applications
+            WHERE status = 'draft' AND aadhaar_hash IS NOT NULL
+        ) AS ranked
+        WHERE app.id = ranked.id AND ranked.rank > 1
+        """
+    )
+    op.create_index('uq_udyam_applications_draft_aadhaar_hash', 'udyam_applications', ['aadhaar_hash'], unique=True, postgresql_where=sa.text("status = 'draft'"))
+
+
+def downgrade() -> None:
+    op.drop_index('uq_udyam_applications_draft_aadhaar_hash', table_name='udyam_applications', postgresql_where=sa.text("status = 'draft'"))
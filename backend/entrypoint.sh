@@ -9,6 +9,6 @@ sleep 5
 echo "Running Alembic migrations..."
 alembic upgrade head
 
-# Start FastAPI server
+# Start the API: one uvicorn worker per CPU
 echo "Starting FastAPI..."
-fastapi run ./src --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec python -m src.commands.serve --host 0.0.0.0 --port 8000
\ No newline at end of file
@@ -1,10 +1,30 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import PlainTextResponse
 
 from src.routes.aadhaar_routes import aadhaar_router
 from src.routes.pan_routes import pan_router
 from src.routes.udyam_routes import udyam_router
+from src.config import Config
 from src.middleware import register_middleware
+from src.responses import FastJSONResponse
+from src.static_assets import register_static_assets, static_assets
+from src.access_log import access_log
+from src.admission import PRIORITY_NAMES, admission_controller
+from src.cache.app_ids import app_id_filter
+from src.cache.app_state import app_state_cache
+from src.db.audit import audit_writer
+from src.db.main import async_engine, replica_engine
+from src.db.pool import pool_status
+from src.lifecycle import READY, lifecycle
+from src.ratelimit import rate_limiter
+from src.singleflight import single_flight
+from src.telemetry.metrics import CONTENT_TYPE, metrics, pool_samples
+from src.telemetry.timing import TimedAPIRoute, timing_histograms
+
+logger = logging.getLogger(__name__)
 
 version = "v1"
 
@@ -14,6 +34,30 @@ description = """
 
 version_prefix = f"/api/{version}"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    access_log.start()
+    static_assets.build()
+    if Config.DB_PREWARM_CONNECTIONS:
+        await lifecycle.warm_up(async_engine, replica_engine, Config.DB_PREWARM_CONNECTIONS)
+    if Config.AUDIT_WRITE_BEHIND:
+        await audit_writer.start()
+    lifecycle.state = READY
+    yield
+    # uvicorn has already closed the listener and waited out its graceful
+    # timeout for open requests; now the queues they fed, then the
+    # connections.
+    lifecycle.drain()
+    if metrics.in_flight:
+        logger.warning("Shutting down with %d requests still in flight", metrics.in_flight)
+    await audit_writer.stop()
+    access_log.stop()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
 app = FastAPI(
     title="Udyam-Backend",
     description=description,
@@ -28,7 +72,10 @@ app = FastAPI(
     openapi_url=f"{version_prefix}/openapi.json",
     docs_url=f"{version_prefix}/docs",
     redoc_url=f"{version_prefix}/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
+app.router.route_class = TimedAPIRoute
 
 register_middleware(app)
 
@@ -39,4 +86,77 @@ app.include_router(udyam_router, prefix=f"{version_prefix}/udyam", tags=["Udyam
 
 @app.get("/", tags=["Health"])
 def health_check():
-    return JSONResponse(content={"status": "ok"})
+    return FastJSONResponse(content={"status": "ok"})
+
+
+@app.get("/ready", tags=["Health"])
+def readiness_check():
+    """503 until startup warmup has finished and again once shutdown begins."""
+    return FastJSONResponse(
+        content={"status": lifecycle.state},
+        status_code=200 if lifecycle.ready else 503,
+    )
+
+
+@app.get("/pool", tags=["Health"])
+def pool_check():
+    content = pool_status(async_engine)
+    content["admission"] = admission_controller.stats()
+    if replica_engine is not None:
+        content["replica"] = pool_status(replica_engine)
+    return FastJSONResponse(content=content)
+
+
+@app.get("/cache", tags=["Health"])
+def cache_check():
+    return FastJSONResponse(
+        content={
+            "app_state": app_state_cache.stats(),
+            "app_ids": app_id_filter.stats(),
+            "rate_limits": rate_limiter.stats(),
+        }
+    )
+
+
+@app.get("/timings", tags=["Health"])
+def timings_check():
+    return FastJSONResponse(content=timing_histograms.summary())
+
+
+@app.get("/metrics", tags=["Health"])
+def metrics_check():
+    samples = pool_samples("primary", async_engine)
+    if replica_engine is not None:
+        samples += pool_samples("replica", replica_engine)
+
+    cache = app_state_cache.stats()
+    ids = app_id_filter.stats()
+    samples += [
+        ("app_state_cache_hits_total", "counter", "Application state cache hits.", {}, cache["hits"]),
+        ("app_state_cache_misses_total", "counter", "Application state cache misses.", {}, cache["misses"]),
+        ("app_id_rejected_total", "counter", "App ids rejected without a query.", {"layer": "negative_cache"}, ids["negative_hits"]),
+    ]
+    admission = admission_controller.stats()
+    samples += [
+        ("admission_in_flight", "gauge", "Requests admitted and still running.", {}, admission["in_flight"]),
+        ("admission_limit", "gauge", "Current adaptive concurrency limit.", {}, admission["limit"]),
+        ("admission_queue_delay_seconds", "gauge", "Standing pool queue delay in the last interval.", {}, admission["queue_delay_ms"] / 1000),
+    ]
+    samples += [
+        ("admission_rejected_total", "counter", "Requests shed with 503.", {"priority": name}, admission["rejected"][name])
+        for name in PRIORITY_NAMES
+    ]
+    samples.append(
+        ("audit_attempts_dropped_total", "counter", "Verification attempts the audit writer could not write.", {}, audit_writer.dropped)
+    )
+    samples.append(
+        ("single_flight_coalesced_total", "counter", "Duplicate requests answered with another's response.", {}, single_flight.coalesced)
+    )
+    samples += [
+        ("rate_limited_total", "counter", "Requests rejected by a rate limit.", {"limit": name}, stats["limited"])
+        for name, stats in rate_limiter.stats().items()
+    ]
+    return PlainTextResponse(metrics.render(samples), media_type=CONTENT_TYPE)
+
+
+register_static_assets(app, version_prefix)
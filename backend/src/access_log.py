@@ -0,0 +1,99 @@
+import logging
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from src.config import Config
+
+logger = logging.getLogger("src.access")
+logger.propagate = False
+logger.setLevel(logging.INFO)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks or formats on the caller's thread.
+
+    Formatting happens in the listener thread; when the queue is full
+    the record is dropped and counted instead of stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AccessLog:
+    """Owns the queue, its handler and the thread that writes to stdout."""
+
+    def __init__(self, max_queue: int = Config.ACCESS_LOG_QUEUE_SIZE) -> None:
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=max_queue))
+        self._listener: QueueListener | None = None
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(logging.Formatter("%(message)s"))
+        self._listener = QueueListener(self.handler.queue, output)
+        self._listener.start()
+        logger.addHandler(self.handler)
+
+    def stop(self) -> None:
+        """Flush queued records and stop the writer thread."""
+        if self._listener is None:
+            return
+        logger.removeHandler(self.handler)
+        self._listener.stop()
+        self._listener = None
+
+
+class AccessLogMiddleware:
+    """Pure ASGI access log: one line per HTTP request, timed with
+    perf_counter_ns. A `sample_rate` below 1 logs that fraction of
+    requests; server errors are always logged."""
+
+    def __init__(self, app, sample_rate: float = Config.ACCESS_LOG_SAMPLE_RATE) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 500 or self.sample_rate >= 1 or random.random() < self.sample_rate:
+                client = scope.get("client") or ("-", 0)
+                logger.info(
+                    "%s:%s - %s %s -> %d in %.4fs",
+                    client[0],
+                    client[1],
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    (time.perf_counter_ns() - start) / 1e9,
+                )
+
+
+access_log = AccessLog()
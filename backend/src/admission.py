@@ -0,0 +1,142 @@
+import time
+
+import orjson
+
+from src.config import Config
+
+# Request classes, most important first. Finishing a registration is
+# worth more than starting a new one, which the client can simply retry.
+CRITICAL, NORMAL, SHEDDABLE = 0, 1, 2
+PRIORITY_NAMES = ("critical", "normal", "sheddable")
+
+# Fraction of the concurrency limit each class may fill, so the classes
+# above it always keep some headroom.
+SHARES = (1.0, 0.8, 0.5)
+
+# Matched against the end of the request path; anything else is NORMAL.
+ROUTE_PRIORITIES = (
+    ("/submit", CRITICAL),
+    ("/verify-otp", NORMAL),
+    ("/verify", NORMAL),
+    ("/send-otp", SHEDDABLE),
+)
+
+
+def route_priority(path: str) -> int:
+    for suffix, priority in ROUTE_PRIORITIES:
+        if path.endswith(suffix):
+            return priority
+    return NORMAL
+
+
+class AdmissionController:
+    """Adaptive concurrency limit driven by connection pool wait time.
+
+    Every primary pool checkout that reused a pooled connection reports
+    how long it queued for it. The smallest wait seen in each `interval`
+    is the standing queue delay: bursts that drain within the interval
+    don't count. While it is above `target` the limit shrinks in
+    proportion to the overshoot, at most halving per interval; below it,
+    the limit grows back by one. A request is admitted while the
+    in-flight count is under its class's share of the limit, so
+    sheddable work is refused first and critical work last.
+    """
+
+    def __init__(
+        self,
+        target_ms: float = Config.ADMISSION_TARGET_DELAY_MS,
+        interval_ms: float = Config.ADMISSION_INTERVAL_MS,
+        max_in_flight: int = Config.ADMISSION_MAX_IN_FLIGHT,
+        min_in_flight: int = Config.ADMISSION_MIN_IN_FLIGHT,
+    ) -> None:
+        self.target_ns = int(target_ms * 1e6)
+        self.interval_ns = int(interval_ms * 1e6)
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.limit = float(max_in_flight)
+        self.in_flight = 0
+        self.delay_ns = 0
+        self.rejected = [0] * len(SHARES)
+        self._window_min_ns: int | None = None
+        self._window_end_ns = time.monotonic_ns() + self.interval_ns
+
+    def observe_wait(self, wait_ns: int, now_ns: int | None = None) -> None:
+        self._roll(time.monotonic_ns() if now_ns is None else now_ns)
+        if self._window_min_ns is None or wait_ns < self._window_min_ns:
+            self._window_min_ns = wait_ns
+
+    def _roll(self, now_ns: int) -> None:
+        if now_ns < self._window_end_ns:
+            return
+        # Windows that passed without a checkout had nobody queueing.
+        idle_windows = (now_ns - self._window_end_ns) // self.interval_ns
+        self.delay_ns = self._window_min_ns or 0
+        if self.delay_ns > self.target_ns:
+            self.limit = max(float(self.min_in_flight), self.limit * max(0.5, self.target_ns / self.delay_ns))
+            growth = idle_windows
+        else:
+            growth = idle_windows + 1
+        self.limit = min(float(self.max_in_flight), self.limit + growth)
+        self._window_min_ns = None
+        self._window_end_ns = now_ns + self.interval_ns
+
+    def admit(self, priority: int, now_ns: int | None = None) -> bool:
+        self._roll(time.monotonic_ns() if now_ns is None else now_ns)
+        if self.in_flight >= self.limit * SHARES[priority]:
+            self.rejected[priority] += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "limit": round(self.limit, 1),
+            "queue_delay_ms": round(self.delay_ns / 1e6, 3),
+            "rejected": dict(zip(PRIORITY_NAMES, self.rejected)),
+        }
+
+
+_OVERLOADED = orjson.dumps({"detail": "Server is overloaded, please retry shortly"})
+
+
+class AdmissionMiddleware:
+    """Fails requests under `prefix` fast with 503 when the controller
+    has no room for their class, instead of letting them queue for a
+    connection until the client gives up."""
+
+    def __init__(self, app, controller: AdmissionController, prefix: str = "/api/") -> None:
+        self.app = app
+        self.controller = controller
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            return await self.app(scope, receive, send)
+
+        controller = self.controller
+        if not controller.admit(route_priority(scope["path"])):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(_OVERLOADED)).encode()),
+                        (b"retry-after", b"1"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": _OVERLOADED})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,32 @@
+import secrets
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from src.config import Config
+
+_bearer = HTTPBearer(auto_error=False, description="The ADMIN_API_KEY setting")
+
+
+class AdminAuth:
+    """Route dependency for back-office endpoints that read or write every
+    application. Callers send `Authorization: Bearer <ADMIN_API_KEY>`;
+    with no key configured those endpoints are switched off."""
+
+    def __init__(self, api_key: str | None = Config.ADMIN_API_KEY) -> None:
+        self.api_key = api_key
+
+    async def __call__(self, credentials: HTTPAuthorizationCredentials | None = Depends(_bearer)) -> None:
+        if not self.api_key:
+            raise HTTPException(status_code=403, detail="Admin API is disabled")
+        if credentials is None or not secrets.compare_digest(
+            credentials.credentials.encode(), self.api_key.encode()
+        ):
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid or missing admin credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+
+require_admin = AdminAuth()
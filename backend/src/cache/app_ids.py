@@ -0,0 +1,53 @@
+import time
+import uuid
+from collections import OrderedDict
+
+from src.config import Config
+
+
+class AppIdFilter:
+    """A short-TTL cache of the app_ids the database recently reported
+    missing.
+
+    A client retrying an unknown id doesn't cost a query each time. Any
+    id it hasn't seen fail goes to the database: rows are also inserted
+    by other workers and the ingest CLI, with ids of any version, so no
+    local snapshot of the table can prove an id absent.
+    """
+
+    def __init__(
+        self,
+        negative_size: int = Config.APP_ID_NEGATIVE_CACHE_SIZE,
+        negative_ttl: float = Config.APP_ID_NEGATIVE_CACHE_TTL,
+    ) -> None:
+        self.negative_size = negative_size
+        self.negative_ttl = negative_ttl
+        self._misses: OrderedDict[uuid.UUID, float] = OrderedDict()
+        self.negative_hits = 0
+
+    def might_exist(self, app_id: uuid.UUID) -> bool:
+        expires_at = self._misses.get(app_id)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                self.negative_hits += 1
+                return False
+            del self._misses[app_id]
+        return True
+
+    def add(self, app_id: uuid.UUID) -> None:
+        self._misses.pop(app_id, None)
+
+    def record_miss(self, app_id: uuid.UUID) -> None:
+        self._misses[app_id] = time.monotonic() + self.negative_ttl
+        self._misses.move_to_end(app_id)
+        while len(self._misses) > self.negative_size:
+            self._misses.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "negative_size": len(self._misses),
+            "negative_hits": self.negative_hits,
+        }
+
+
+app_id_filter = AppIdFilter()
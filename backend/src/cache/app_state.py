@@ -0,0 +1,185 @@
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.cache.app_ids import AppIdFilter, app_id_filter
+from src.config import Config
+from src.db.models import UdyamApplication
+
+
+class InvalidTransitionError(ValueError):
+    """The application is not in a state that allows the requested step."""
+
+
+@dataclass(frozen=True, slots=True)
+class AppState:
+    aadhaar_verified: bool
+    pan_verified: bool
+    status: str
+    version: int
+
+
+# Columns every state-changing statement returns so the cache can be
+# written through without a second read.
+STATE_COLUMNS = (
+    UdyamApplication.id,
+    UdyamApplication.aadhaar_verified,
+    UdyamApplication.pan_verified,
+    UdyamApplication.status,
+    UdyamApplication.version,
+)
+
+# Flag that must already be set before each step may run; every step
+# also requires the application to still be a draft.
+STEP_REQUIRES = {
+    "verify_otp": None,
+    "verify_pan": "aadhaar_verified",
+    "submit": "pan_verified",
+}
+
+_STEP_MESSAGES = {
+    "aadhaar_verified": "Aadhaar must be verified before PAN verification",
+    "pan_verified": "PAN must be verified before submission",
+}
+
+
+def step_condition(step: str):
+    """WHERE clause enforcing STEP_REQUIRES[step] in the UPDATE itself."""
+    condition = UdyamApplication.status == "draft"
+    required = STEP_REQUIRES[step]
+    if required is not None:
+        condition = condition & (getattr(UdyamApplication, required) == True)  # noqa: E712
+    return condition
+
+
+def state_query(app_id: uuid.UUID):
+    return select(*STATE_COLUMNS).where(UdyamApplication.id == app_id)
+
+
+def check_transition(state: AppState, step: str) -> None:
+    if state.status != "draft":
+        raise InvalidTransitionError(f"Application is already {state.status}")
+    required = STEP_REQUIRES[step]
+    if required is not None and not getattr(state, required):
+        raise InvalidTransitionError(_STEP_MESSAGES[required])
+
+
+def parse_app_id(app_id) -> uuid.UUID:
+    """A malformed id can't name an application, so it is a miss outright."""
+    if isinstance(app_id, uuid.UUID):
+        return app_id
+    try:
+        return uuid.UUID(str(app_id))
+    except ValueError:
+        raise ValueError("Application not found") from None
+
+
+class AppStateCache:
+    """Bounded LRU of application state with a TTL, keyed by app_id.
+
+    Status only moves forward (draft to submitted or superseded), so a
+    cached terminal status is safe to act on even if another worker
+    wrote since, and it is the only thing acted on from cache. The
+    verification flags can be reset by a resent OTP, so cached flags are
+    only a hint; the guarded UPDATE still has the final say.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = Config.APP_STATE_CACHE_SIZE,
+        ttl: float = Config.APP_STATE_CACHE_TTL,
+        id_filter: AppIdFilter | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.id_filter = id_filter
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[uuid.UUID, tuple[AppState, float]] = OrderedDict()
+
+    def get(self, app_id: uuid.UUID) -> AppState | None:
+        entry = self._entries.get(app_id)
+        if entry is not None:
+            state, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(app_id)
+                self.hits += 1
+                return state
+            del self._entries[app_id]
+        self.misses += 1
+        return None
+
+    def put(self, app_id: uuid.UUID, state: AppState) -> None:
+        # Concurrent requests can finish out of order; never let an older
+        # version overwrite a newer one.
+        current = self._entries.get(app_id)
+        if current is not None and current[0].version > state.version:
+            state = current[0]
+        self._entries[app_id] = (state, time.monotonic() + self.ttl)
+        self._entries.move_to_end(app_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put_row(self, row, inserted: bool = False) -> None:
+        if inserted and self.id_filter is not None:
+            self.id_filter.add(row.id)
+        self.put(
+            row.id,
+            AppState(
+                aadhaar_verified=row.aadhaar_verified,
+                pan_verified=row.pan_verified,
+                status=row.status,
+                version=row.version,
+            ),
+        )
+
+    def discard(self, app_id: uuid.UUID) -> None:
+        self._entries.pop(app_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def guard(self, app_id: uuid.UUID, step: str) -> None:
+        """Reject `step` up front when the cached status is already final,
+        or the id is known not to exist."""
+        state = self.get(app_id)
+        if state is None:
+            if self.id_filter is not None and not self.id_filter.might_exist(app_id):
+                raise ValueError("Application not found")
+        elif state.status != "draft":
+            check_transition(state, step)
+
+    async def explain_failure(self, session: AsyncSession, app_id: uuid.UUID, step: str) -> Exception:
+        """Why a guarded UPDATE matched no row: a missing application or a
+        disallowed step. Only runs on the failure path."""
+        row = (await session.exec(state_query(app_id))).first()
+        if row is None:
+            if self.id_filter is not None:
+                self.id_filter.record_miss(app_id)
+            return ValueError("Application not found")
+        self.put_row(row)
+        try:
+            check_transition(self.get(app_id), step)
+        except InvalidTransitionError as e:
+            return e
+        # The row changed between the UPDATE and this read.
+        return InvalidTransitionError("Application changed concurrently; retry the request")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+app_state_cache = AppStateCache(id_filter=app_id_filter)
@@ -0,0 +1,122 @@
+"""Measure the CPU time JSON responses cost per request.
+
+    python -m src.commands.bench_json --requests 5000
+
+Each payload is served twice through a bare ASGI call. The first run uses
+FastAPI's default path: response_model validation, jsonable_encoder and
+json.dumps. The second returns a FastJSONResponse straight from the endpoint.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import date, datetime
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from src.responses import FastJSONResponse
+from src.schemas.aadhaar_schemas import AadhaarSendOtpResponse
+from src.schemas.udyam_schemas import ApplicationListResponse
+
+
+def _otp_response() -> AadhaarSendOtpResponse:
+    return AadhaarSendOtpResponse(
+        transactionId=str(uuid.uuid4()), otpSentTo="XXXX-XXXX-1234", appId=str(uuid.uuid4())
+    )
+
+
+def _list_page(rows: int) -> dict:
+    now = datetime(2024, 5, 1, 10, 30, 15, 123456)
+    return {
+        "items": [
+            {
+                "id": uuid.uuid4(),
+                "entrepreneur_name": "Asha Traders",
+                "aadhaar_last4": "1234",
+                "aadhaar_verified": True,
+                "pan_masked": "ABCDE*****F",
+                "pan_verified": True,
+                "dob_or_doi": date(1990, 1, 1),
+                "type_of_organisation": "Proprietary",
+                "status": "submitted",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _ in range(rows)
+        ],
+        "nextCursor": "eyJjIjoiMjAyNC0wNS0wMVQxMDozMDoxNSJ9",
+    }
+
+
+def build_apps(page_rows: int) -> tuple[FastAPI, FastAPI]:
+    otp, page = _otp_response(), _list_page(page_rows)
+
+    baseline = FastAPI(default_response_class=JSONResponse)
+    baseline.post("/send-otp", response_model=AadhaarSendOtpResponse)(lambda: otp)
+    baseline.get("/applications", response_model=ApplicationListResponse)(lambda: page)
+
+    fast = FastAPI(default_response_class=FastJSONResponse)
+    fast.post("/send-otp", response_model=AadhaarSendOtpResponse)(lambda: FastJSONResponse(otp))
+    fast.get("/applications", response_model=ApplicationListResponse)(lambda: FastJSONResponse(page))
+    return baseline, fast
+
+
+async def _call(app, method: str, path: str) -> int:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return size
+
+
+async def measure(app, method: str, path: str, requests: int) -> tuple[float, int]:
+    """CPU microseconds per request and response size."""
+    size = await _call(app, method, path)
+    start = time.process_time_ns()
+    for _ in range(requests):
+        await _call(app, method, path)
+    return (time.process_time_ns() - start) / requests / 1000, size
+
+
+async def run(args: argparse.Namespace) -> None:
+    baseline, fast = build_apps(args.page_rows)
+    print(f"{'endpoint':<28}{'default us':>12}{'fast us':>10}{'saved us':>10}{'bytes':>8}")
+    for method, path, label in (
+        ("POST", "/send-otp", "send-otp"),
+        ("GET", "/applications", f"applications ({args.page_rows} rows)"),
+    ):
+        slow_us, size = await measure(baseline, method, path, args.requests)
+        fast_us, _ = await measure(fast, method, path, args.requests)
+        print(f"{label:<28}{slow_us:>12.1f}{fast_us:>10.1f}{slow_us - fast_us:>10.1f}{size:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--page-rows", type=int, default=100)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
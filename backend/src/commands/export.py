@@ -0,0 +1,55 @@
+"""Export applications to a file with constant memory.
+
+    python -m src.commands.export --format csv --output applications.csv
+    python -m src.commands.export --format ndjson --gzip --output - > applications.ndjson.gz
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from src.config import Config
+from src.db.main import async_engine, async_session_maker
+from src.services.export_service import EXPORT_FORMATS, export_bytes, export_filename
+
+
+async def run(args: argparse.Namespace) -> None:
+    output = args.output or export_filename(args.format, args.gzip)
+    stream = export_bytes(
+        async_session_maker,
+        args.format,
+        compress=args.gzip,
+        status=args.status or None,
+        created_from=args.created_from,
+        created_to=args.created_to,
+        chunk_size=args.chunk_size,
+    )
+    size = 0
+    handle = sys.stdout.buffer if output == "-" else open(output, "wb")
+    try:
+        async for chunk in stream:
+            handle.write(chunk)
+            size += len(chunk)
+    finally:
+        if handle is not sys.stdout.buffer:
+            handle.close()
+    await async_engine.dispose()
+    if output != "-":
+        print(f"Wrote {size} bytes to {output}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--output", help="file to write, '-' for stdout (default: dated file name)")
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument("--status", default="submitted", help="application status to export; empty for all")
+    parser.add_argument("--created-from", type=datetime.fromisoformat)
+    parser.add_argument("--created-to", type=datetime.fromisoformat)
+    parser.add_argument("--chunk-size", type=int, default=Config.EXPORT_CHUNK_SIZE)
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
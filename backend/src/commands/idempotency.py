@@ -0,0 +1,27 @@
+"""Maintenance for stored Idempotency-Key responses.
+
+    python -m src.commands.idempotency purge
+"""
+import argparse
+import asyncio
+
+from src.db.main import async_engine
+from src.idempotency import IdempotencyStore
+
+
+async def run(args: argparse.Namespace) -> None:
+    removed = await IdempotencyStore(engine=async_engine).purge_expired()
+    print(f"Purged {removed} expired idempotency key(s)")
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("purge", help="delete expired idempotency keys")
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
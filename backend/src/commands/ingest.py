@@ -0,0 +1,63 @@
+"""Bulk-load applications from an NDJSON file.
+
+    python -m src.commands.ingest legacy.ndjson[.gz] [--chunk-size N] [--errors errors.ndjson]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+
+from src.config import Config
+from src.db.main import async_engine
+from src.services.import_service import ImportService
+
+
+async def read_lines(handle):
+    for line in handle:
+        yield line
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.path == "-":
+        handle = sys.stdin.buffer
+    elif args.path.endswith(".gz"):
+        handle = gzip.open(args.path, "rb")
+    else:
+        handle = open(args.path, "rb")
+
+    service = ImportService(
+        engine=async_engine,
+        chunk_size=args.chunk_size,
+        max_reported_errors=args.max_errors,
+    )
+    try:
+        report = await service.ingest(read_lines(handle))
+    finally:
+        if handle is not sys.stdin.buffer:
+            handle.close()
+    await async_engine.dispose()
+
+    if args.errors:
+        with open(args.errors, "w") as out:
+            for error in report["errors"]:
+                out.write(json.dumps(error) + "\n")
+    else:
+        for error in report["errors"]:
+            print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    print(f"Received {report['received']}, inserted {report['inserted']}, failed {report['failed']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="NDJSON file, optionally gzipped, or '-' for stdin")
+    parser.add_argument("--chunk-size", type=int, default=Config.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--max-errors", type=int, default=Config.IMPORT_MAX_REPORTED_ERRORS,
+                        help="per-record errors to keep in the report")
+    parser.add_argument("--errors", help="write per-record errors to this NDJSON file")
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
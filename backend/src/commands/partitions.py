@@ -0,0 +1,41 @@
+"""Maintenance for the monthly verification_attempts partitions.
+
+    python -m src.commands.partitions ensure [--months-ahead N]
+    python -m src.commands.partitions prune [--retention-months N] [--drop]
+"""
+import argparse
+import asyncio
+
+from src.config import Config
+from src.db.main import async_engine
+from src.db.partitions import ensure_partitions, prune_partitions
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with async_engine.begin() as conn:
+        if args.command == "ensure":
+            names = await ensure_partitions(conn, args.months_ahead)
+            print(f"Created {len(names)} partition(s): {', '.join(names) or '-'}")
+        else:
+            names = await prune_partitions(conn, args.retention_months, drop=args.drop)
+            action = "Dropped" if args.drop else "Detached"
+            print(f"{action} {len(names)} partition(s): {', '.join(names) or '-'}")
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ensure = sub.add_parser("ensure", help="create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=Config.ATTEMPTS_PARTITIONS_AHEAD)
+
+    prune = sub.add_parser("prune", help="detach partitions past the retention window")
+    prune.add_argument("--retention-months", type=int, default=Config.ATTEMPTS_RETENTION_MONTHS)
+    prune.add_argument("--drop", action="store_true", help="drop detached partitions")
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
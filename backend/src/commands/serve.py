@@ -0,0 +1,290 @@
+"""Run the API with one uvicorn worker process per CPU.
+
+    python -m src.commands.serve --host 0.0.0.0 --port 8000
+    python -m src.commands.serve --workers 4 --max-requests 20000
+
+Each worker runs uvloop and httptools. The supervisor replaces any
+worker that exits, including those that retire after --max-requests.
+Pool sizes are capped so that every worker's pool together stays under
+the connections Postgres allows.
+
+/metrics only describes the worker that answers it, so worker i also
+listens on --metrics-port + i; point Prometheus at each of those ports.
+Worker i keeps its slot number (the `worker` label) across restarts.
+
+By default the workers accept on one shared listening socket. With
+--reuse-port each binds its own SO_REUSEPORT socket instead, so the
+kernel spreads connections evenly across them; but connections the
+kernel has queued on a worker's socket are reset when that worker
+exits, so --reuse-port is only the default with --max-requests 0,
+where workers exit only on shutdown.
+"""
+import argparse
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+
+import uvicorn
+
+from src.config import Config
+
+logger = logging.getLogger("src.serve")
+
+spawn = multiprocessing.get_context("spawn")
+
+
+def default_workers() -> int:
+    """CPUs this process may use: its affinity mask, further limited by
+    a container's CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def cgroup_cpu_quota(root: str = "/sys/fs/cgroup") -> float | None:
+    """CPUs' worth of time the cgroup may use per period, or None when
+    it has no quota (or isn't a cgroup v1/v2 host)."""
+    try:
+        with open(os.path.join(root, "cpu.max")) as f:  # cgroup v2
+            quota, period = f.read().split()[:2]
+        if quota == "max":
+            return None
+    except OSError:
+        try:
+            with open(os.path.join(root, "cpu", "cpu.cfs_quota_us")) as f:  # cgroup v1
+                quota = f.read().strip()
+            with open(os.path.join(root, "cpu", "cpu.cfs_period_us")) as f:
+                period = f.read().strip()
+        except OSError:
+            return None
+        if int(quota) <= 0:
+            return None
+    return int(quota) / int(period)
+
+
+def pool_sizes(budget: int, workers: int, pool_size: int, max_overflow: int) -> tuple[int, int]:
+    """Largest (pool_size, max_overflow) within the configured ones that
+    keeps `workers` full pools inside a budget of `budget` connections."""
+    per_worker = max(1, budget // workers)
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+async def connection_budget(url: str, reserved: int) -> int:
+    """Connections left for the app: max_connections less the slots
+    Postgres keeps for superusers and `reserved` for everything else
+    (migrations, cron jobs, psql sessions)."""
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    engine = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            max_connections = int((await conn.execute(text("SHOW max_connections"))).scalar())
+            superuser = int((await conn.execute(text("SHOW superuser_reserved_connections"))).scalar())
+    finally:
+        await engine.dispose()
+    return max_connections - superuser - reserved
+
+
+def bind_socket(host: str, port: int, reuse_port: bool, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that, on the first SIGTERM, reports not ready and
+    keeps serving for `prestop_delay` seconds before shutting down, so
+    load balancers polling /ready stop routing here before the listener
+    closes. Open requests then get uvicorn's graceful timeout. SIGINT or
+    a second SIGTERM stops at once."""
+
+    def __init__(self, config: uvicorn.Config, lifecycle, prestop_delay: float) -> None:
+        super().__init__(config)
+        self.lifecycle = lifecycle
+        self.prestop_delay = prestop_delay
+        self._prestop: threading.Timer | None = None
+
+    def handle_exit(self, sig, frame) -> None:
+        if sig != signal.SIGTERM or self._prestop is not None or self.prestop_delay <= 0:
+            if self._prestop is not None:
+                self._prestop.cancel()
+            return super().handle_exit(sig, frame)
+        self.lifecycle.drain()
+        # uvicorn only polls should_exit, so setting it from a timer
+        # thread is safe.
+        self._prestop = threading.Timer(self.prestop_delay, super().handle_exit, (sig, frame))
+        self._prestop.daemon = True
+        self._prestop.start()
+
+
+def run_worker(host: str, port: int, sock: socket.socket | None, options: dict) -> None:
+    """Worker process body: its own socket unless one was handed down,
+    plus its own metrics port."""
+    from src.lifecycle import lifecycle
+    from src.telemetry.metrics import WORKER_ENV
+
+    index = options["worker_index"]
+    os.environ[WORKER_ENV] = str(index)
+    if sock is None:
+        sock = bind_socket(host, port, reuse_port=True, backlog=options["backlog"])
+    sockets = [sock]
+    if options["metrics_port"]:
+        sockets.append(bind_socket(host, options["metrics_port"] + index, reuse_port=False, backlog=64))
+    config = uvicorn.Config(
+        "src:app",
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        access_log=False,
+        proxy_headers=True,
+        forwarded_allow_ips=options["forwarded_allow_ips"],
+        backlog=options["backlog"],
+        timeout_keep_alive=options["keep_alive"],
+        timeout_graceful_shutdown=options["graceful_timeout"],
+        limit_max_requests=options["max_requests"] or None,
+    )
+    DrainingServer(config, lifecycle, options["prestop_delay"]).run(sockets=sockets)
+
+
+class Supervisor:
+    """Keeps `workers` worker processes running until told to stop."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.should_exit = threading.Event()
+        self.processes: list[multiprocessing.Process] = []
+        # Without SO_REUSEPORT every worker accepts on one shared socket,
+        # which outlives any one worker.
+        self.shared_socket = None
+        if not args.reuse_port:
+            self.shared_socket = bind_socket(args.host, args.port, False, args.backlog)
+
+    def spawn(self, index: int) -> multiprocessing.Process:
+        args = self.args
+        # Jitter so workers started together don't all retire together.
+        max_requests = args.max_requests
+        if max_requests and args.max_requests_jitter:
+            max_requests += random.randint(0, args.max_requests_jitter)
+        options = {
+            "backlog": args.backlog,
+            "keep_alive": args.keep_alive,
+            "graceful_timeout": args.graceful_timeout,
+            "prestop_delay": args.prestop_delay,
+            "forwarded_allow_ips": args.forwarded_allow_ips,
+            "max_requests": max_requests,
+            "worker_index": index,
+            "metrics_port": args.metrics_port,
+        }
+        process = spawn.Process(
+            target=run_worker,
+            args=(args.host, args.port, self.shared_socket, options),
+            daemon=False,
+        )
+        process.start()
+        logger.info("Started worker %d as #%d (max_requests=%s)", process.pid, index, max_requests or "unlimited")
+        return process
+
+    def run(self) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: self.should_exit.set())
+
+        self.processes = [self.spawn(i) for i in range(self.args.workers)]
+        while not self.should_exit.wait(0.5):
+            for i, process in enumerate(self.processes):
+                if not process.is_alive():
+                    process.join()
+                    logger.info("Worker %d exited with %s; replacing it", process.pid, process.exitcode)
+                    self.processes[i] = self.spawn(i)
+        self.stop()
+
+    def stop(self) -> None:
+        """SIGTERM every worker so it drains, then kill what is left."""
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        # The pre-stop delay, uvicorn's graceful window, then the queue flush.
+        timeout = self.args.prestop_delay + self.args.graceful_timeout + 15
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning("Worker %d did not stop in time; killing it", process.pid)
+                process.kill()
+                process.join()
+        if self.shared_socket is not None:
+            self.shared_socket.close()
+
+
+def size_pools(args: argparse.Namespace) -> None:
+    """Export per-worker DB_POOL_SIZE/DB_MAX_OVERFLOW for the workers."""
+    budget = args.db_max_connections
+    if not budget:
+        try:
+            budget = asyncio.run(connection_budget(Config.DATABASE_URL, args.db_reserved_connections))
+        except Exception:
+            logger.warning("Could not read max_connections; keeping the configured pool sizes", exc_info=True)
+            return
+
+    size, overflow = pool_sizes(budget, args.workers, Config.DB_POOL_SIZE, Config.DB_MAX_OVERFLOW)
+    if budget < args.workers:
+        logger.warning("Only %d connections for %d workers; each still gets one", budget, args.workers)
+    os.environ["DB_POOL_SIZE"] = str(size)
+    os.environ["DB_MAX_OVERFLOW"] = str(overflow)
+    logger.info(
+        "%d workers x (pool %d + overflow %d) within a budget of %d connections",
+        args.workers, size, overflow, budget,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=Config.SERVER_WORKERS or default_workers())
+    parser.add_argument("--max-requests", type=int, default=Config.SERVER_MAX_REQUESTS, help="retire a worker after this many requests; 0 never")
+    parser.add_argument("--max-requests-jitter", type=int, default=Config.SERVER_MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=float, default=Config.SERVER_GRACEFUL_TIMEOUT)
+    parser.add_argument("--prestop-delay", type=float, default=Config.SHUTDOWN_PRESTOP_DELAY, help="seconds to keep serving, not ready, after SIGTERM")
+    parser.add_argument("--metrics-port", type=int, default=Config.SERVER_METRICS_PORT, help="worker i also serves on this port + i; 0 disables")
+    parser.add_argument("--keep-alive", type=int, default=5)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--forwarded-allow-ips", default=Config.FORWARDED_ALLOW_IPS, help="proxies trusted to set X-Forwarded-For; comma-separated")
+    parser.add_argument("--reuse-port", action=argparse.BooleanOptionalAction, help="one SO_REUSEPORT socket per worker; default only without --max-requests")
+    parser.add_argument("--db-max-connections", type=int, default=Config.DB_MAX_CONNECTIONS, help="connection budget for all workers; 0 asks Postgres")
+    parser.add_argument("--db-reserved-connections", type=int, default=Config.DB_RESERVED_CONNECTIONS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [serve] %(message)s")
+    if args.reuse_port is None:
+        args.reuse_port = not args.max_requests
+    elif args.reuse_port and args.max_requests:
+        logger.warning("Connections queued on a retiring worker's socket will be reset")
+    if args.reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+        logger.warning("SO_REUSEPORT is not supported here; sharing one socket")
+        args.reuse_port = False
+
+    size_pools(args)
+    Supervisor(args).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.config import Config
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses fall back to gzip
+    brotli = None
+
+# Preference order when a client accepts several encodings equally.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Media types worth compressing; anything else (gzip downloads, Parquet,
+# images) is either compressed already or gains nothing.
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """Quality value per coding in an Accept-Encoding header."""
+    accepted = {}
+    for part in header.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip()] = quality
+    return accepted
+
+
+def choose_encoding(header: str | None, available=ENCODINGS) -> str | None:
+    """Best of `available` the client accepts, or None for identity."""
+    if not header:
+        return None
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int | None = None) -> bytes:
+    """One-shot compression, defaulting to the strongest level."""
+    if encoding == "gzip":
+        return gzip.compress(body, 9 if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=11 if level is None else level)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk, so a
+    streamed body reaches the client as it is produced."""
+
+    def __init__(self, encoding: str, level: int) -> None:
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """Compresses response bodies with the best encoding the client accepts.
+
+    Only the first `minimum_size` bytes are held back: a body that ends
+    below it is sent as it is, anything longer is compressed chunk by
+    chunk. Responses that already carry a Content-Encoding, or whose
+    media type does not compress, pass straight through.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = Config.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = Config.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = Config.COMPRESSION_BROTLI_QUALITY,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        minimum_size = self.minimum_size
+        start_message = None
+        passthrough = False
+        pending: list[bytes] = []
+        pending_size = 0
+        compressor: StreamCompressor | None = None
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough, pending_size, compressor
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                length = headers.get("content-length")
+                if (
+                    message["status"] in (204, 304)
+                    or "content-encoding" in headers
+                    or not compressible(headers.get("content-type", ""))
+                    or (length is not None and int(length) < minimum_size)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                pending.append(body)
+                pending_size += len(body)
+                if pending_size < minimum_size:
+                    if more_body:
+                        return
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(pending)})
+                    return
+
+                body = b"".join(pending)
+                pending.clear()
+                compressor = StreamCompressor(encoding, self.levels[encoding])
+                headers = MutableHeaders(scope=start_message)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -7,6 +7,116 @@ class Settings(BaseSettings):
   POSTGRES_DB: str
   TEST_DATABASE_URL: str
   BACKEND_DOMAIN: str
+
+  # Optional streaming replica for read-only routes
+  DATABASE_REPLICA_URL: str | None = None
+  REPLICA_MAX_LAG_SECONDS: float = 5.0
+  REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+  REPLICA_LAG_PROBE_TIMEOUT: float = 1.0
+
+  # Connection pool
+  DB_POOL_SIZE: int = 10
+  DB_MAX_OVERFLOW: int = 10
+  DB_POOL_TIMEOUT: float = 30.0
+  DB_POOL_RECYCLE: int = 1800
+  DB_POOL_PRE_PING: bool = False
+  DB_STATEMENT_CACHE_SIZE: int = 500
+  # Connections opened and warmed at startup, at most the pool size
+  DB_PREWARM_CONNECTIONS: int = 5
+
+  # Production server (src.commands.serve); 0 workers means one per CPU
+  SERVER_WORKERS: int = 0
+  SERVER_MAX_REQUESTS: int = 10000
+  SERVER_MAX_REQUESTS_JITTER: int = 1000
+  SERVER_GRACEFUL_TIMEOUT: float = 30.0
+  # Worker i also listens on this port + i, for scraping its /metrics; 0 disables
+  SERVER_METRICS_PORT: int = 9100
+  # Proxies whose X-Forwarded-For/-Proto are trusted; comma-separated
+  FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+  # Seconds a worker keeps serving, reporting not ready, after SIGTERM
+  SHUTDOWN_PRESTOP_DELAY: float = 5.0
+  # Connections all workers may hold together; 0 reads max_connections
+  DB_MAX_CONNECTIONS: int = 0
+  DB_RESERVED_CONNECTIONS: int = 10
+
+  # Verification attempt write-behind
+  AUDIT_WRITE_BEHIND: bool = True
+  AUDIT_BATCH_SIZE: int = 500
+  AUDIT_FLUSH_INTERVAL: float = 0.5
+  AUDIT_QUEUE_SIZE: int = 10000
+  AUDIT_ENQUEUE_TIMEOUT: float = 1.0
+  AUDIT_WRITE_RETRIES: int = 3
+  AUDIT_RETRY_DELAY: float = 0.5
+  AUDIT_MAX_RETRY_DELAY: float = 30.0
+
+  # verification_attempts partition maintenance
+  ATTEMPTS_PARTITIONS_AHEAD: int = 3
+  ATTEMPTS_RETENTION_MONTHS: int = 24
+
+  # Idempotency-Key replay
+  IDEMPOTENCY_TTL_SECONDS: int = 86400
+  IDEMPOTENCY_CACHE_SIZE: int = 10000
+  IDEMPOTENCY_PERSIST: bool = True
+  # Seconds a duplicate waits for the first request's response, and
+  # seconds before a claim whose worker died can be taken over
+  IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+  IDEMPOTENCY_LEASE_SECONDS: float = 60.0
+
+  # Access log
+  ACCESS_LOG_ENABLED: bool = True
+  ACCESS_LOG_SAMPLE_RATE: float = 1.0
+  ACCESS_LOG_QUEUE_SIZE: int = 10000
+
+  # Server-Timing header and per-phase histograms
+  SERVER_TIMING_ENABLED: bool = True
+
+  # Prometheus /metrics
+  METRICS_ENABLED: bool = True
+
+  # Per-route rate limits as "<count>/<second|minute|hour|day>"; empty disables one
+  RATE_LIMIT_ENABLED: bool = True
+  RATE_LIMIT_MAX_KEYS: int = 50000
+  RATE_LIMIT_SEND_OTP_IP: str = "20/minute"
+  RATE_LIMIT_SEND_OTP_AADHAAR: str = "5/minute"
+  RATE_LIMIT_VERIFY_OTP_APP: str = "10/minute"
+  RATE_LIMIT_VERIFY_PAN_APP: str = "10/minute"
+  RATE_LIMIT_SUBMIT_APP: str = "5/minute"
+
+  # Concurrent identical verify/submit POSTs share one execution
+  SINGLE_FLIGHT_ENABLED: bool = True
+
+  # Admission control: shed load once pool checkouts start queueing
+  ADMISSION_ENABLED: bool = True
+  ADMISSION_TARGET_DELAY_MS: float = 50.0
+  ADMISSION_INTERVAL_MS: float = 100.0
+  ADMISSION_MAX_IN_FLIGHT: int = 100
+  ADMISSION_MIN_IN_FLIGHT: int = 4
+
+  # Response compression
+  COMPRESSION_ENABLED: bool = True
+  COMPRESSION_MINIMUM_SIZE: int = 1024
+  COMPRESSION_GZIP_LEVEL: int = 6
+  COMPRESSION_BROTLI_QUALITY: int = 4
+
+  # Bearer token for the back-office routes (listing, export, import);
+  # unset disables them
+  ADMIN_API_KEY: str | None = None
+
+  # Bulk export
+  EXPORT_CHUNK_SIZE: int = 1000
+
+  # Application state cache
+  APP_STATE_CACHE_SIZE: int = 100000
+  APP_STATE_CACHE_TTL: float = 300.0
+
+  # Negative lookups for unknown app_ids
+  APP_ID_NEGATIVE_CACHE_SIZE: int = 100000
+  APP_ID_NEGATIVE_CACHE_TTL: float = 60.0
+
+  # Bulk import
+  IMPORT_CHUNK_SIZE: int = 5000
+  IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
   model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 Config = Settings()
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlmodel import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import Config
+from src.db.models import VerificationAttempt
+from src.telemetry.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# The writer's batched INSERT, also run once at startup to warm it up.
+ATTEMPT_INSERT = insert(VerificationAttempt.__table__)
+
+
+class AuditWriter:
+    """Write-behind queue for VerificationAttempt rows.
+
+    Attempts are queued after the request's own transaction commits and
+    written in batches by a background task, either once `batch_size`
+    rows are waiting or `flush_interval` seconds after the first one
+    arrived. When the queue is full, producers wait up to
+    `enqueue_timeout` and then write their row directly, so memory stays
+    bounded and rows are never dropped for lack of space.
+
+    The background task retries failed writes with backoff for as long
+    as the writer runs. A batch that still fails after `retries`
+    attempts is written row by row, and only rows the database rejects
+    as invalid are dropped. A producer writing its own row gives up
+    after `retries` attempts instead, so a database outage can't hold
+    its request. Rows given up on, and anything still unwritten when
+    stop() gives up, are counted in `dropped`.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        batch_size: int = Config.AUDIT_BATCH_SIZE,
+        flush_interval: float = Config.AUDIT_FLUSH_INTERVAL,
+        max_queue: int = Config.AUDIT_QUEUE_SIZE,
+        enqueue_timeout: float = Config.AUDIT_ENQUEUE_TIMEOUT,
+        retries: int = Config.AUDIT_WRITE_RETRIES,
+        retry_delay: float = Config.AUDIT_RETRY_DELAY,
+        max_retry_delay: float = Config.AUDIT_MAX_RETRY_DELAY,
+    ) -> None:
+        self._engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.dropped = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        # Rows the background task is writing and has not finished yet.
+        self._unwritten: list[dict] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from src.db.main import async_engine
+
+            self._engine = async_engine
+        return self._engine
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything still queued and stop the background task."""
+        if not self.running:
+            return
+        try:
+            self._queue.put_nowait(_STOP)
+        except asyncio.QueueFull:
+            # The task is busy writing; it checks this between batches.
+            self._stopping = True
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            lost = len(self._unwritten) + sum(row is not _STOP for row in _drain(self._queue))
+            self.dropped += lost
+            logger.error(
+                "Audit writer did not drain within %ss; dropped %d unwritten rows (%d dropped in total)",
+                timeout,
+                lost,
+                self.dropped,
+            )
+        self._task = None
+        self._unwritten = []
+
+    async def commit_and_record(
+        self, session: AsyncSession, attempt: VerificationAttempt
+    ) -> None:
+        """Commit the session's pending work and record `attempt`.
+
+        Without a running writer the attempt is simply added to the
+        session and goes out in the same commit.
+        """
+        if not self.running:
+            session.add(attempt)
+            await session.commit()
+        else:
+            await session.commit()
+            await self.record(attempt)
+        metrics.observe_attempt(attempt.kind, attempt.success)
+
+    async def record(self, attempt: VerificationAttempt) -> None:
+        row = self._to_row(attempt)
+        try:
+            await asyncio.wait_for(self._queue.put(row), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            # Queue is saturated: write this row ourselves rather than drop it.
+            await self._write([row], retry_forever=False)
+
+    @staticmethod
+    def _to_row(attempt: VerificationAttempt) -> dict:
+        row = {
+            column.name: getattr(attempt, column.name)
+            for column in VerificationAttempt.__table__.columns
+        }
+        if row["id"] is None:
+            row["id"] = uuid.uuid4()
+        return row
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping and not self._stopping:
+            row = await self._queue.get()
+            if row is _STOP:
+                break
+
+            batch = [row]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    row = self._queue.get_nowait()
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            self._unwritten = batch
+            await self._write(batch, retry_forever=True)
+            self._unwritten = []
+
+        # Drain whatever producers managed to enqueue before shutdown.
+        rest = [row for row in _drain(self._queue) if row is not _STOP]
+        for i in range(0, len(rest), self.batch_size):
+            self._unwritten = rest[i:]
+            await self._write(rest[i : i + self.batch_size], retry_forever=True)
+        self._unwritten = []
+
+    async def _write(self, rows: list[dict], retry_forever: bool) -> None:
+        delay = self.retry_delay
+        for attempt in range(self.retries if len(rows) > 1 else 0):
+            try:
+                await self._insert(rows)
+                return
+            except (DataError, IntegrityError):
+                # A bad row fails the whole batch however often it is retried.
+                break
+            except Exception:
+                logger.warning(
+                    "Writing %d verification attempts failed (attempt %d); retrying in %.1fs",
+                    len(rows), attempt + 1, delay, exc_info=True,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+        # Row by row, so one invalid row doesn't take the batch with it.
+        for row in rows:
+            await self._write_row(row, retry_forever)
+
+    async def _write_row(self, row: dict, retry_forever: bool) -> None:
+        delay = self.retry_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await self._insert([row])
+                return
+            except (DataError, IntegrityError):
+                self.dropped += 1
+                logger.exception("Dropping invalid verification attempt %s", row["id"])
+                return
+            except Exception:
+                if not retry_forever and attempt >= self.retries:
+                    self.dropped += 1
+                    logger.exception(
+                        "Dropping verification attempt %s after %d failed writes",
+                        row["id"], attempt,
+                    )
+                    return
+                logger.warning(
+                    "Writing verification attempt %s failed; retrying in %.1fs",
+                    row["id"], delay, exc_info=True,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+    async def _insert(self, rows: list[dict]) -> None:
+        async with self.engine.begin() as conn:
+            await conn.execute(ATTEMPT_INSERT, rows)
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+audit_writer = AuditWriter()
@@ -1,11 +1,115 @@
-from sqlalchemy.ext.asyncio import AsyncEngine
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel, create_engine
+from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
+from src.db.pool import InstrumentedQueuePool, PrimaryQueuePool
+from src.telemetry.timing import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind; 0 when it has replayed everything it
+# received (an idle primary leaves the replay timestamp stale).
+REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+def build_engine(url: str, poolclass=InstrumentedQueuePool):
+    """Create an async engine whose pool is sized from Settings."""
+    connect_args = {}
+    if make_url(url).get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = Config.DB_STATEMENT_CACHE_SIZE
+
+    engine = create_async_engine(
+        url,
+        poolclass=poolclass,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    instrument_engine(engine)
+    return engine
+
+
+class ReplicaRouter:
+    """Sends reads to the replica while its measured lag is acceptable.
+
+    Lag is probed at most once per `check_interval`, in a background
+    task, so no request waits on it; requests get the last probe's answer
+    (the primary until the first one finishes). A failed probe, one
+    slower than `probe_timeout`, or a lag above `max_lag` routes reads to
+    the primary until the next one.
+    """
+
+    def __init__(
+        self, engine, max_lag: float, check_interval: float, probe_timeout: float = 1.0
+    ) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.probe_timeout = probe_timeout
+        self.lag: float | None = None
+        self._healthy = False
+        self._checked_at = float("-inf")
+        self._probe: asyncio.Task | None = None
+
+    async def use_replica(self) -> bool:
+        probing = self._probe is not None and not self._probe.done()
+        if not probing and time.monotonic() - self._checked_at >= self.check_interval:
+            self._probe = asyncio.create_task(self._check())
+        return self._healthy
 
-async_engine = AsyncEngine(create_engine(url=Config.DATABASE_URL))
+    async def _check(self) -> None:
+        try:
+            self.lag = await asyncio.wait_for(self._probe_lag(), self.probe_timeout)
+            self._healthy = self.lag <= self.max_lag
+        except Exception:
+            logger.warning("Replica lag probe failed; reading from primary", exc_info=True)
+            self.lag = None
+            self._healthy = False
+        finally:
+            self._checked_at = time.monotonic()
+
+    async def _probe_lag(self) -> float:
+        async with self.engine.connect() as conn:
+            return float((await conn.execute(REPLICA_LAG_SQL)).scalar())
+
+
+async_engine = build_engine(Config.DATABASE_URL, poolclass=PrimaryQueuePool)
+
+async_session_maker = sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+replica_engine = None
+replica_session_maker = None
+replica_router = None
+if Config.DATABASE_REPLICA_URL:
+    replica_engine = build_engine(Config.DATABASE_REPLICA_URL)
+    replica_session_maker = sessionmaker(
+        bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    replica_router = ReplicaRouter(
+        replica_engine,
+        max_lag=Config.REPLICA_MAX_LAG_SECONDS,
+        check_interval=Config.REPLICA_LAG_CHECK_INTERVAL,
+        probe_timeout=Config.REPLICA_LAG_PROBE_TIMEOUT,
+    )
 
 
 async def init_db() -> None:
@@ -13,10 +117,20 @@ async def init_db() -> None:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
+async def read_session_maker():
+    """Session factory for read-only work: the replica when it is healthy."""
+    if replica_router is not None and await replica_router.use_replica():
+        return replica_session_maker
+    return async_session_maker
+
+
 async def get_session() -> AsyncSession: # type: ignore
-    Session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
+    async with async_session_maker() as session:
+        yield session
+
 
-    async with Session() as session:
-        yield session
\ No newline at end of file
+async def get_read_session() -> AsyncSession: # type: ignore
+    """Dependency for read-only routes; may be bound to the replica."""
+    maker = await read_session_maker()
+    async with maker() as session:
+        yield session
@@ -1,6 +1,6 @@
 import uuid
 import sqlalchemy.dialects.postgresql as pg
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from typing import Optional, Any
 from sqlmodel import (
     Column,
@@ -9,12 +9,25 @@ from sqlmodel import (
     Relationship,
 )
 from sqlalchemy import (
+    DDL,
     Boolean,
     Text,
     ForeignKey,
+    Index,
     Integer,
+    event,
+    text,
 )
 from enum import Enum
+from src.db.ids import uuid7
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    """Timestamps are stored as UTC in TIMESTAMP WITHOUT TIME ZONE
+    columns, which asyncpg refuses to compare with an aware datetime."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 class YesNo(str, Enum):
@@ -28,9 +41,22 @@ class GSTINStatus(str, Enum):
 
 class UdyamApplication(SQLModel, table=True):
     __tablename__ = "udyam_applications"
+    __table_args__ = (
+        # At most one open draft per Aadhaar; send-otp upserts against it.
+        Index(
+            "uq_udyam_applications_draft_aadhaar_hash",
+            "aadhaar_hash",
+            unique=True,
+            postgresql_where=text("status = 'draft'"),
+        ),
+        # Keyset pagination for the application listing, with and
+        # without a status filter.
+        Index("ix_udyam_applications_created_at_id", "created_at", "id"),
+        Index("ix_udyam_applications_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: uuid.UUID = Field(
-        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid7)
     )
 
     entrepreneur_name: Optional[str] = Field(
@@ -104,7 +130,13 @@ class UdyamApplication(SQLModel, table=True):
     status: str = Field(
         default="draft",
         max_length=20,
-        sa_column=Column(pg.VARCHAR(20), default="draft", nullable=False, index=True),
+        sa_column=Column(pg.VARCHAR(20), default="draft", nullable=False),
+    )
+
+    # Bumped by every state-changing UPDATE.
+    version: int = Field(
+        default=1,
+        sa_column=Column(Integer, default=1, server_default=text("1"), nullable=False),
     )
 
     form_payload: dict[str, Any] = Field(
@@ -130,10 +162,11 @@ class UdyamApplication(SQLModel, table=True):
         ),
     )
 
-    # Relationships (example, assuming you might link attempts back)
+    # Attempt history is never loaded implicitly; callers that need it opt in
+    # with .options(selectinload(UdyamApplication.verification_attempts)).
     verification_attempts: list["VerificationAttempt"] = Relationship(
         back_populates="udyam_application",
-        sa_relationship_kwargs={"lazy": "selectin"},  # Or "selectin" for eager loading
+        sa_relationship_kwargs={"lazy": "raise"},
     )
     
     @property
@@ -147,6 +180,17 @@ class UdyamApplication(SQLModel, table=True):
 
 class VerificationAttempt(SQLModel, table=True):
     __tablename__ = "verification_attempts"
+    __table_args__ = (
+        # Serves per-application history in (created_at, id) keyset order.
+        Index(
+            "ix_verification_attempts_app_id_created_at_id",
+            "app_id",
+            "created_at",
+            "id",
+        ),
+        # Monthly range partitions; see src/db/partitions.py.
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: uuid.UUID = Field(
         sa_column=Column(pg.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -158,7 +202,6 @@ class VerificationAttempt(SQLModel, table=True):
             pg.UUID(as_uuid=True),
             ForeignKey("udyam_applications.id"),
             nullable=False,
-            index=True,
         )
     )
 
@@ -180,10 +223,14 @@ class VerificationAttempt(SQLModel, table=True):
         default=None, sa_column=Column(Text, nullable=True)  # Text for longer messages
     )
 
+    # Part of the primary key because it is the partition key.
     created_at: datetime = Field(
         default_factory=datetime.utcnow,
         sa_column=Column(
-            pg.TIMESTAMP(timezone=False), default=datetime.utcnow, nullable=False
+            pg.TIMESTAMP(timezone=False),
+            primary_key=True,
+            default=datetime.utcnow,
+            nullable=False,
         ),
     )
 
@@ -191,3 +238,48 @@ class VerificationAttempt(SQLModel, table=True):
     udyam_application: Optional[UdyamApplication] = Relationship(
         back_populates="verification_attempts"
     )
+
+
+class IdempotencyKey(SQLModel, table=True):
+    __tablename__ = "idempotency_keys"
+
+    key: str = Field(
+        max_length=255,
+        sa_column=Column(pg.VARCHAR(255), primary_key=True),
+    )
+
+    request_hash: str = Field(
+        max_length=64, sa_column=Column(pg.VARCHAR(64), nullable=False)
+    )
+
+    # NULL while the request that claimed the key is still running.
+    status_code: Optional[int] = Field(default=None, sa_column=Column(Integer, nullable=True))
+
+    response_body: Optional[bytes] = Field(default=None, sa_column=Column(pg.BYTEA, nullable=True))
+
+    media_type: Optional[str] = Field(
+        default=None, max_length=100, sa_column=Column(pg.VARCHAR(100), nullable=True)
+    )
+
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=False), default=datetime.utcnow, nullable=False
+        ),
+    )
+
+    expires_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=False), nullable=False, index=True)
+    )
+
+
+# Tables built by metadata.create_all() (tests, init_db) get a catch-all
+# partition so inserts work before any monthly partition exists.
+event.listen(
+    VerificationAttempt.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS verification_attempts_default "
+        "PARTITION OF verification_attempts DEFAULT"
+    ),
+)
@@ -0,0 +1,45 @@
+import base64
+import uuid
+from datetime import datetime
+
+from sqlmodel import tuple_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Opaque cursor pointing just past the given (created_at, id) key."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def seek_before(stmt, created_at_col, id_col, cursor: str | None):
+    """Apply newest-first keyset ordering on (created_at, id) to a select.
+
+    Rows strictly older than the cursor's key are returned, so the row
+    comparison can be answered straight from a (.., created_at, id) index.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(created_at_col, id_col) < tuple_(created_at, row_id))
+    return stmt.order_by(created_at_col.desc(), id_col.desc())
+
+
+def split_page(rows: list, limit: int) -> tuple[list, str | None]:
+    """Trim a limit + 1 fetch to one page and build the next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
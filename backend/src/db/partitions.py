@@ -0,0 +1,146 @@
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+PARENT_TABLE = "verification_attempts"
+
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month covered by a monthly partition, or None for any other table."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expired_partitions(names: list[str], retention_months: int, today: date) -> list[str]:
+    """Monthly partitions whose whole range is older than the retention window."""
+    cutoff = add_months(month_start(today), -retention_months)
+    expired = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+async def list_partitions(conn: AsyncConnection) -> list[str]:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent AND child.relkind IN ('r', 'p')"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return [row[0] for row in result]
+
+
+async def default_partition(conn: AsyncConnection) -> str | None:
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent "
+            "AND pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT'"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return result.scalar()
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, months_ahead: int, today: date | None = None
+) -> list[str]:
+    """Create any missing partitions from this month to `months_ahead` out.
+
+    Postgres refuses to create a partition while the default partition
+    holds rows in its range, so when it does the default is detached,
+    the months are created, those rows are moved into them and the
+    default is attached again. Run this in a transaction, so a failure
+    part way never leaves the default detached.
+    """
+    current = month_start(today or date.today())
+    existing = set(await list_partitions(conn))
+    missing = [
+        month
+        for month in (add_months(current, offset) for offset in range(months_ahead + 1))
+        if partition_name(month) not in existing
+    ]
+    if not missing:
+        return []
+
+    # The default holds no rows of existing partitions, so one range
+    # across the missing months only catches rows that belong to them.
+    bounds = {"start": missing[0], "end": add_months(missing[-1], 1)}
+    in_range = "created_at >= :start AND created_at < :end"
+    default = await default_partition(conn)
+    moving = False
+    if default is not None:
+        result = await conn.execute(
+            text(f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE {in_range})'), bounds
+        )
+        moving = result.scalar()
+    if moving:
+        await conn.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{default}"'))
+
+    created = []
+    for month in missing:
+        name = partition_name(month)
+        await conn.execute(
+            text(
+                f'CREATE TABLE "{name}" PARTITION OF {PARENT_TABLE} '
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            )
+        )
+        created.append(name)
+
+    if moving:
+        await conn.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{default}" WHERE {in_range} RETURNING *) '
+                f"INSERT INTO {PARENT_TABLE} SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        await conn.execute(text(f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION "{default}" DEFAULT'))
+    return created
+
+
+async def prune_partitions(
+    conn: AsyncConnection,
+    retention_months: int,
+    drop: bool = False,
+    today: date | None = None,
+) -> list[str]:
+    """Detach (and optionally drop) partitions past the retention window.
+
+    Detaching is a catalog change, so purging a month of history costs the
+    same regardless of how many rows it holds.
+    """
+    names = await list_partitions(conn)
+    expired = expired_partitions(names, retention_months, today or date.today())
+    for name in expired:
+        await conn.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+        if drop:
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+    return expired
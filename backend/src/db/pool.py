@@ -0,0 +1,88 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.admission import admission_controller
+from src.telemetry.timing import note_checkout
+
+
+class PoolStats:
+    """Running checkout counters for one connection pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ns_total = 0
+        self.wait_ns_max = 0
+        self.wait_ns_last = 0
+
+    def record_checkout(self, wait_ns: int) -> None:
+        self.checkouts += 1
+        self.wait_ns_total += wait_ns
+        self.wait_ns_last = wait_ns
+        if wait_ns > self.wait_ns_max:
+            self.wait_ns_max = wait_ns
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    # Told how long checkouts queued, if set.
+    admission = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter_ns()
+        started_at = time.time()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            if self.admission is not None:
+                self.admission.observe_wait(time.perf_counter_ns() - start)
+            raise
+        wait_ns = time.perf_counter_ns() - start
+        self.stats.record_checkout(wait_ns)
+        note_checkout(wait_ns)
+        # A checkout that (re)connected waited on the handshake, not on
+        # the queue; counting it would shed load after every cold start.
+        if self.admission is not None and conn._connection_record.starttime < started_at:
+            self.admission.observe_wait(wait_ns)
+        return conn
+
+
+class PrimaryQueuePool(InstrumentedQueuePool):
+    """The primary's pool: its queue is what admission control protects.
+    Replica checkouts queue on another server and don't count."""
+
+    admission = admission_controller
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """Snapshot of pool occupancy and checkout wait times for an engine."""
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        avg_ns = stats.wait_ns_total / stats.checkouts if stats.checkouts else 0
+        status.update(
+            {
+                "checkouts": stats.checkouts,
+                "timeouts": stats.timeouts,
+                "wait_ms_avg": round(avg_ns / 1e6, 3),
+                "wait_ms_max": round(stats.wait_ns_max / 1e6, 3),
+                "wait_ms_last": round(stats.wait_ns_last / 1e6, 3),
+            }
+        )
+    return status
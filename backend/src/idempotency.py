@@ -0,0 +1,404 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy.dialects.postgresql as pg
+from fastapi import HTTPException, Request, Response
+from sqlmodel import delete, select, update
+
+from src.config import Config
+from src.db.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+# Responses larger than this are passed through but never stored.
+MAX_STORED_BODY = 64 * 1024
+# Outcomes a retry could legitimately change are not replayed.
+_TRANSIENT_STATUSES = {401, 403, 408, 409, 425, 429}
+# Matched against the end of the request path. Only these small JSON
+# POSTs are buffered and deduplicated; uploads like the NDJSON import
+# stream straight through.
+IDEMPOTENT_ROUTES = ("/aadhaar/send-otp", "/pan/verify", "/submit")
+
+
+@dataclass
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: bytes
+    media_type: str | None
+    expires_at: float
+
+
+class IdempotentReplay(Exception):
+    """Raised by idempotency_claim when the key already has a response."""
+
+    def __init__(self, stored: StoredResponse) -> None:
+        self.stored = stored
+
+
+@dataclass
+class Claim:
+    """One request's hold on a scoped key, from idempotency_claim until
+    the middleware has stored (or given up on) its response."""
+
+    store: "IdempotencyStore"
+    key: str
+    request_hash: str
+    owned: bool = False
+    lock: asyncio.Lock | None = None
+
+
+class IdempotencyStore:
+    """Saved responses by Idempotency-Key: an in-process LRU in front of
+    the idempotency_keys table, both expiring after `ttl` seconds.
+
+    A request claims its key by inserting a pending row; a concurrent
+    duplicate, on this worker or another, finds the row and polls until
+    the response is stored, for up to `wait_timeout` seconds. A pending
+    row whose worker died expires after `lease` seconds. Without
+    `persist`, claims are only serialized within this process.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = Config.IDEMPOTENCY_CACHE_SIZE,
+        ttl: float = Config.IDEMPOTENCY_TTL_SECONDS,
+        persist: bool = Config.IDEMPOTENCY_PERSIST,
+        engine=None,
+        lease: float = Config.IDEMPOTENCY_LEASE_SECONDS,
+        wait_timeout: float = Config.IDEMPOTENCY_WAIT_SECONDS,
+        poll_interval: float = 0.1,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist = persist
+        self._engine = engine
+        self.lease = lease
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._entries: OrderedDict[str, StoredResponse] = OrderedDict()
+        self._locks: dict[str, list] = {}
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from src.db.main import async_engine
+
+            self._engine = async_engine
+        return self._engine
+
+    def cached(self, key: str) -> StoredResponse | None:
+        """The response stored for `key` in this process, if any."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.time():
+                self._entries.move_to_end(key)
+                return entry
+            del self._entries[key]
+        return None
+
+    async def acquire(self, claim: Claim) -> None:
+        """Take the key for this request, or raise IdempotentReplay with
+        the response it already has. Database errors are logged and the
+        request goes ahead unprotected."""
+        if not self.persist:
+            entry = self._locks.get(claim.key)
+            if entry is None:
+                entry = self._locks[claim.key] = [asyncio.Lock(), 0]
+            entry[1] += 1
+            claim.lock = entry[0]
+            await claim.lock.acquire()
+            stored = self.cached(claim.key)
+            if stored is not None:
+                _check_hash(stored, claim)
+                raise IdempotentReplay(stored)
+            claim.owned = True
+            return
+
+        try:
+            claim.owned = await self._claim_row(claim)
+        except (HTTPException, IdempotentReplay):
+            raise
+        except Exception:
+            logger.exception("Idempotency claim failed")
+
+    async def _claim_row(self, claim: Claim) -> bool:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            now = datetime.utcnow()
+            async with self.engine.begin() as conn:
+                claimed = await conn.execute(
+                    pg.insert(IdempotencyKey)
+                    .values(
+                        key=claim.key,
+                        request_hash=claim.request_hash,
+                        expires_at=now + timedelta(seconds=self.lease),
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(IdempotencyKey.key)
+                )
+                if claimed.first() is not None:
+                    return True
+                row = (
+                    await conn.execute(select(IdempotencyKey).where(IdempotencyKey.key == claim.key))
+                ).first()
+                if row is not None and row.expires_at <= now:
+                    # An expired response or a dead worker's lease: free it and claim again.
+                    await conn.execute(
+                        delete(IdempotencyKey).where(
+                            IdempotencyKey.key == claim.key, IdempotencyKey.expires_at <= now
+                        )
+                    )
+                    continue
+            if row is None:
+                continue
+
+            if row.status_code is not None:
+                stored = StoredResponse(
+                    request_hash=row.request_hash,
+                    status_code=row.status_code,
+                    body=row.response_body,
+                    media_type=row.media_type,
+                    expires_at=row.expires_at.replace(tzinfo=timezone.utc).timestamp(),
+                )
+                self._remember(claim.key, stored)
+                _check_hash(stored, claim)
+                raise IdempotentReplay(stored)
+            if row.request_hash != claim.request_hash:
+                raise HTTPException(status_code=422, detail=_REUSED_KEY)
+            if time.monotonic() >= deadline:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(self.poll_interval)
+
+    async def complete(self, claim: Claim, status_code: int, body: bytes, media_type: str | None) -> None:
+        """Store the owner's response for replay."""
+        self._remember(
+            claim.key,
+            StoredResponse(claim.request_hash, status_code, body, media_type, time.time() + self.ttl),
+        )
+        if not self.persist:
+            return
+
+        stmt = (
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == claim.key)
+            .values(
+                status_code=status_code,
+                response_body=body,
+                media_type=media_type,
+                expires_at=datetime.utcnow() + timedelta(seconds=self.ttl),
+            )
+        )
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(stmt)
+        except Exception:
+            logger.exception("Failed to persist idempotency key")
+
+    async def release(self, claim: Claim, stored: bool) -> None:
+        """End the claim; a key whose response wasn't stored is freed
+        for the next attempt."""
+        try:
+            if claim.owned and not stored and self.persist:
+                async with self.engine.begin() as conn:
+                    await conn.execute(
+                        delete(IdempotencyKey).where(
+                            IdempotencyKey.key == claim.key, IdempotencyKey.status_code.is_(None)
+                        )
+                    )
+        except Exception:
+            logger.exception("Failed to release idempotency key")
+        finally:
+            if claim.lock is not None:
+                claim.lock.release()
+                entry = self._locks[claim.key]
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[claim.key]
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        for key in [k for k, v in self._entries.items() if v.expires_at <= now]:
+            del self._entries[key]
+        if not self.persist:
+            return 0
+        async with self.engine.begin() as conn:
+            result = await conn.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+            )
+        return result.rowcount
+
+    def _remember(self, key: str, entry: StoredResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_REUSED_KEY = "Idempotency-Key was already used for a different request"
+
+
+def _check_hash(stored: StoredResponse, claim: Claim) -> None:
+    if stored.request_hash != claim.request_hash:
+        raise HTTPException(status_code=422, detail=_REUSED_KEY)
+
+
+def scoped_key(method: str, path: str, key: str) -> str:
+    """The client's key only names a request on one endpoint: the same
+    key sent to another method or path is a different entry."""
+    return hashlib.sha256(f"{method} {path}\n{key}".encode()).hexdigest()
+
+
+async def idempotency_claim(request: Request) -> None:
+    """Route dependency that claims the request's Idempotency-Key.
+
+    Declared after the route's rate limits, so a request that is
+    refused never reaches the database. A duplicate is answered with
+    the stored response through IdempotentReplay.
+    """
+    claim = request.scope.get("state", {}).get("idempotency")
+    if claim is not None:
+        await claim.store.acquire(claim)
+
+
+async def replay_response(request: Request, exc: IdempotentReplay) -> Response:
+    stored = exc.stored
+    return Response(
+        stored.body,
+        status_code=stored.status_code,
+        media_type=stored.media_type,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+class IdempotencyMiddleware:
+    """Replay the saved response for a POST that repeats an Idempotency-Key.
+
+    Keys are scoped to the method and path, and bound to a hash of the
+    body. Reusing a key on the same endpoint with a different body is
+    rejected with 422. Only paths ending in one of `routes` are handled.
+
+    Responses cached in this process are replayed here. Anything else
+    waits for the route's idempotency_claim dependency, which runs after
+    its rate limits; this middleware then stores the response.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, routes: tuple[str, ...] = IDEMPOTENT_ROUTES) -> None:
+        self.app = app
+        self.store = store
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].endswith(self.routes):
+            return await self.app(scope, receive, send)
+
+        key = None
+        for name, value in scope["headers"]:
+            if name == HEADER:
+                key = value.decode("latin-1")
+                break
+        if key is None:
+            return await self.app(scope, receive, send)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return await _send_json(send, 400, {"detail": "Invalid Idempotency-Key header"})
+
+        body = await _read_body(receive)
+        key = scoped_key(scope["method"], scope["path"], key)
+        request_hash = hashlib.sha256(body).hexdigest()
+
+        stored = self.store.cached(key)
+        if stored is not None:
+            if stored.request_hash != request_hash:
+                return await _send_json(send, 422, {"detail": _REUSED_KEY})
+            return await _replay(send, stored)
+
+        claim = Claim(self.store, key, request_hash)
+        scope.setdefault("state", {})["idempotency"] = claim
+        kept = False
+        try:
+            kept = await self._call_and_store(scope, body, receive, send, claim)
+        finally:
+            await self.store.release(claim, kept)
+
+    async def _call_and_store(self, scope, body, receive, send, claim: Claim) -> bool:
+        status_code = 500
+        media_type = None
+        chunks: list[bytes] = []
+        size = 0
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture_send(message):
+            nonlocal status_code, media_type, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name == b"content-type":
+                        media_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body" and size <= MAX_STORED_BODY:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                chunks.append(chunk)
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+
+        if not claim.owned:
+            return False
+        if status_code < 500 and status_code not in _TRANSIENT_STATUSES and size <= MAX_STORED_BODY:
+            await self.store.complete(claim, status_code, b"".join(chunks), media_type)
+            return True
+        return False
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+async def _replay(send, stored: StoredResponse) -> None:
+    headers = [
+        (b"content-length", str(len(stored.body)).encode()),
+        (b"idempotent-replayed", b"true"),
+    ]
+    if stored.media_type:
+        headers.append((b"content-type", stored.media_type.encode("latin-1")))
+    await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+async def _send_json(send, status_code: int, content: dict) -> None:
+    body = json.dumps(content).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,116 @@
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from datetime import date
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.cache.app_state import state_query
+from src.db.audit import ATTEMPT_INSERT, AuditWriter
+from src.db.models import VerificationAttempt
+from src.services.aadhaar_service import draft_upsert, verify_otp_update
+from src.services.attempt_service import attempts_query
+from src.services.pan_service import verify_pan_update
+from src.services.udyam_service import applications_query, submit_update
+
+logger = logging.getLogger(__name__)
+
+STARTING, READY, DRAINING = "starting", "ready", "draining"
+
+# Every optional field filled in, so the warmed submit UPDATE sets the
+# same columns as a real submission.
+_WARMUP_FORM = {
+    "entrepreneurName": "warmup",
+    "typeOfOrganisation": "Others",
+    "dobOrDoi": date(2000, 1, 1),
+    "previousYearITR": "1",
+    "hasGSTIN": "1",
+}
+
+
+async def run_hot_statements(conn, writes: bool = True) -> None:
+    """Execute each statement the request path uses once on `conn`, in a
+    transaction that is rolled back. That compiles them into the
+    engine's statement cache and prepares them on this connection."""
+    trans = await conn.begin()
+    try:
+        async with AsyncSession(bind=conn) as session:
+            app_id = uuid.UUID(int=0)
+            if writes:
+                # A random Aadhaar per connection, so concurrent warmups
+                # never wait on each other's draft row.
+                aadhaar_number = f"{uuid.uuid4().int % 10**12:012d}"
+                app_id = (await session.exec(draft_upsert(aadhaar_number, "warmup", True))).one().id
+                await session.exec(verify_otp_update(app_id))
+                await session.exec(verify_pan_update(app_id, "ABCDE*****F", "0" * 64, "warmup", date(2000, 1, 1)))
+                await session.exec(submit_update(app_id, _WARMUP_FORM))
+                attempt = VerificationAttempt(app_id=app_id, kind="aadhaar_otp", success=True, payload={})
+                await conn.execute(ATTEMPT_INSERT, [AuditWriter._to_row(attempt)])
+            await session.exec(state_query(app_id))
+            await session.exec(attempts_query(app_id, 20, None))
+            await session.exec(applications_query())
+    finally:
+        await trans.rollback()
+
+
+async def prewarm(engine, connections: int, writes: bool = True) -> int:
+    """Open up to `connections` pool connections at once and run the hot
+    statements on each; they stay in the pool afterwards."""
+    connections = min(connections, engine.pool.size())
+    async with contextlib.AsyncExitStack() as stack:
+        # Let every task finish before raising, so no connection is
+        # closed while another task is still using it.
+        conns = _raise_first(
+            await asyncio.gather(
+                *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+                return_exceptions=True,
+            )
+        )
+        _raise_first(
+            await asyncio.gather(
+                *(run_hot_statements(conn, writes) for conn in conns),
+                return_exceptions=True,
+            )
+        )
+    return connections
+
+
+def _raise_first(results: list) -> list:
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class Lifecycle:
+    """Where the app is in its lifespan. Readiness only turns on once
+    warmup has finished and turns off again as soon as shutdown starts."""
+
+    def __init__(self) -> None:
+        self.state = STARTING
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    async def warm_up(self, primary, replica, connections: int) -> None:
+        """Prewarm both pools; replica connections only run the reads.
+        A failure is logged and startup carries on cold."""
+        start = time.perf_counter()
+        try:
+            warmed = await prewarm(primary, connections)
+            if replica is not None:
+                await prewarm(replica, connections, writes=False)
+        except Exception:
+            logger.warning("Connection pool warmup failed; starting cold", exc_info=True)
+            return
+        logger.info("Warmed %d connections in %.0f ms", warmed, (time.perf_counter() - start) * 1000)
+
+    def drain(self) -> None:
+        """Stop reporting ready; the server keeps serving what it gets."""
+        self.state = DRAINING
+
+
+lifecycle = Lifecycle()
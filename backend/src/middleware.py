@@ -1,10 +1,16 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-import time
 import logging
 
+from src.access_log import AccessLogMiddleware
+from src.admission import AdmissionMiddleware, admission_controller
+from src.compression import CompressionMiddleware
 from src.config import Config
+from src.idempotency import IdempotencyMiddleware, IdempotentReplay, idempotency_store, replay_response
+from src.singleflight import SingleFlightMiddleware, single_flight
+from src.telemetry.metrics import MetricsMiddleware, metrics
+from src.telemetry.timing import ServerTimingMiddleware, timing_histograms
 
 logger = logging.getLogger("uvicorn.access")
 logger.disabled = True
@@ -13,19 +19,17 @@ domain = Config.BACKEND_DOMAIN
 
 
 def register_middleware(app: FastAPI):
-    # Custom logging middleware
-    @app.middleware("http")
-    async def custom_logging(request: Request, call_next):
-        start_time = time.time()
+    # Double-clicked verify/submit POSTs wait for the first one's response
+    if Config.SINGLE_FLIGHT_ENABLED:
+        app.add_middleware(SingleFlightMiddleware, flights=single_flight)
 
-        response = await call_next(request)
-        processing_time = round(time.time() - start_time, 4)
+    # Replays stored responses for retried POSTs carrying an Idempotency-Key
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+    app.add_exception_handler(IdempotentReplay, replay_response)
 
-        print(
-            f"{request.client.host}:{request.client.port} - {request.method} {request.url.path} "
-            f"-> {response.status_code} in {processing_time}s"
-        )
-        return response
+    # gzip/brotli for bodies above the size threshold, streamed ones included
+    if Config.COMPRESSION_ENABLED:
+        app.add_middleware(CompressionMiddleware, minimum_size=Config.COMPRESSION_MINIMUM_SIZE)
 
     # CORS middleware
     # app.add_middleware(
@@ -61,3 +65,20 @@ def register_middleware(app: FastAPI):
             "*.onrender.com",  # Allow all Render subdomains (safer for testing)
         ],
     )
+
+    # Fast 503s for lower-priority routes while pool checkouts queue
+    if Config.ADMISSION_ENABLED:
+        app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
+    # Access log, written off the event loop; outside admission, trusted
+    # hosts and idempotency so their sheds, 400s and replays are logged
+    if Config.ACCESS_LOG_ENABLED:
+        app.add_middleware(AccessLogMiddleware, sample_rate=Config.ACCESS_LOG_SAMPLE_RATE)
+
+    # Per-phase Server-Timing header; outermost so it sees the whole request
+    if Config.SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware, histograms=timing_histograms)
+
+    # Request counts, latency histograms and in-flight gauge for /metrics
+    if Config.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
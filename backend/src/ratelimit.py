@@ -0,0 +1,158 @@
+import hashlib
+import math
+import time
+from array import array
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+import orjson
+from fastapi import Depends, HTTPException, Request
+
+from src.config import Config
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+KeyFunc = Callable[[Request], Awaitable[str | None]]
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """'10/minute' -> (10, 60): requests allowed per period in seconds."""
+    count, _, period = rate.partition("/")
+    try:
+        return int(count), _PERIODS[period.strip().rstrip("s")]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit {rate!r}, expected '<count>/<second|minute|hour|day>'")
+
+
+class TokenBuckets:
+    """One token bucket per key, stored in two flat float arrays.
+
+    A bucket holds up to `count` tokens and refills at count/period per
+    second; each request takes one. Keys map to array slots through an
+    LRU dict, so the table never grows past `max_keys` and the least
+    recently seen key gives up its slot (and starts over full) first.
+    """
+
+    def __init__(self, count: int, period: float, max_keys: int) -> None:
+        self.capacity = float(count)
+        self.rate = count / period
+        self.max_keys = max_keys
+        self._tokens = array("d", bytes(8 * max_keys))
+        self._updated = array("d", bytes(8 * max_keys))
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self.limited = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def hit(self, key: str, now: float | None = None) -> float:
+        """Take a token for `key`: 0 when allowed, else seconds until one is free."""
+        now = time.monotonic() if now is None else now
+        slot = self._slots.get(key)
+        if slot is None:
+            if len(self._slots) < self.max_keys:
+                slot = len(self._slots)
+            else:
+                _, slot = self._slots.popitem(last=False)
+            self._slots[key] = slot
+            tokens = self.capacity
+        else:
+            self._slots.move_to_end(key)
+            tokens = min(self.capacity, self._tokens[slot] + (now - self._updated[slot]) * self.rate)
+
+        self._updated[slot] = now
+        if tokens >= 1:
+            self._tokens[slot] = tokens - 1
+            return 0.0
+        self._tokens[slot] = tokens
+        self.limited += 1
+        return (1 - tokens) / self.rate
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self.limited = 0
+
+
+async def _json_body(request: Request) -> dict:
+    # FastAPI has already read the body, so this only re-parses it.
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+async def client_ip(request: Request) -> str | None:
+    return request.client.host if request.client else None
+
+
+async def aadhaar_hash(request: Request) -> str | None:
+    """Same SHA-256 the service stores, so the raw number is never a key."""
+    number = (await _json_body(request)).get("aadhaarNumber")
+    if not isinstance(number, str):
+        return None
+    return hashlib.sha256(number.encode()).hexdigest()
+
+
+async def app_id(request: Request) -> str | None:
+    value = request.path_params.get("app_id")
+    if value is None:
+        body = await _json_body(request)
+        value = body.get("appId") or body.get("app_id")
+    return str(value) if value is not None else None
+
+
+class RateLimit:
+    """Route dependency that answers 429 with Retry-After once `key`
+    has used up its bucket. Declared in a route's `dependencies`, it
+    runs before the endpoint's own dependencies, the session included."""
+
+    def __init__(self, name: str, rate: str, key: KeyFunc, max_keys: int, enabled: bool = True) -> None:
+        self.name = name
+        self.rate = rate
+        self.key = key
+        self.enabled = enabled and bool(rate)
+        self.buckets = TokenBuckets(*parse_rate(rate), max_keys) if self.enabled else None
+
+    async def __call__(self, request: Request) -> None:
+        if not self.enabled:
+            return
+        key = await self.key(request)
+        if key is None:
+            return
+        retry_after = self.buckets.hit(key)
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+
+class RateLimiter:
+    """Registry of the app's rate limits, for stats and resets."""
+
+    def __init__(self, enabled: bool = Config.RATE_LIMIT_ENABLED, max_keys: int = Config.RATE_LIMIT_MAX_KEYS) -> None:
+        self.enabled = enabled
+        self.max_keys = max_keys
+        self.limits: dict[str, RateLimit] = {}
+
+    def limit(self, name: str, rate: str, key: KeyFunc):
+        """Depends() for a named limit; an empty `rate` disables it."""
+        limit = self.limits[name] = RateLimit(name, rate, key, self.max_keys, self.enabled)
+        return Depends(limit)
+
+    def clear(self) -> None:
+        for limit in self.limits.values():
+            if limit.buckets is not None:
+                limit.buckets.clear()
+
+    def stats(self) -> dict:
+        return {
+            name: {"rate": limit.rate, "keys": len(limit.buckets), "limited": limit.buckets.limited}
+            for name, limit in self.limits.items()
+            if limit.buckets is not None
+        }
+
+
+rate_limiter = RateLimiter()
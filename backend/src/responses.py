@@ -0,0 +1,29 @@
+import uuid
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    # orjson only knows uuid.UUID itself, not asyncpg's subclass.
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered straight to bytes.
+
+    A Pydantic model is serialized by its own compiled serializer; anything
+    else goes through orjson, which handles UUIDs, datetimes and enums
+    natively. Returning one of these from an endpoint also skips FastAPI's
+    response_model re-validation and jsonable pass.
+    """
+
+    def render(self, content) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,6 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
+from src.cache.app_state import InvalidTransitionError
+from src.config import Config
+from src.idempotency import idempotency_claim
+from src.ratelimit import aadhaar_hash, app_id, client_ip, rate_limiter
+from src.telemetry.timing import TimedAPIRoute
 from src.db.main import get_session
+from src.responses import FastJSONResponse
 from src.services.aadhaar_service import AadhaarService
 from src.schemas.aadhaar_schemas import (
     AadhaarSendOtpRequest,
@@ -9,12 +15,20 @@ from src.schemas.aadhaar_schemas import (
     AadhaarVerifyOtpResponse,
 )
 
-aadhaar_router = APIRouter()
+aadhaar_router = APIRouter(route_class=TimedAPIRoute)
 
 aadhaar_service = AadhaarService()
 
 
-@aadhaar_router.post("/send-otp", response_model=AadhaarSendOtpResponse)
+@aadhaar_router.post(
+    "/send-otp",
+    response_model=AadhaarSendOtpResponse,
+    dependencies=[
+        rate_limiter.limit("send-otp:ip", Config.RATE_LIMIT_SEND_OTP_IP, client_ip),
+        rate_limiter.limit("send-otp:aadhaar", Config.RATE_LIMIT_SEND_OTP_AADHAAR, aadhaar_hash),
+        Depends(idempotency_claim),
+    ],
+)
 async def send_otp(
     payload: AadhaarSendOtpRequest,
     session: AsyncSession = Depends(get_session),
@@ -29,12 +43,16 @@ async def send_otp(
             consent=payload.consent,
             session=session,
         )
-        return AadhaarSendOtpResponse(**result)
+        return FastJSONResponse(AadhaarSendOtpResponse(**result))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@aadhaar_router.post("/verify-otp", response_model=AadhaarVerifyOtpResponse)
+@aadhaar_router.post(
+    "/verify-otp",
+    response_model=AadhaarVerifyOtpResponse,
+    dependencies=[rate_limiter.limit("verify-otp:app", Config.RATE_LIMIT_VERIFY_OTP_APP, app_id)],
+)
 async def verify_otp(
     payload: AadhaarVerifyOtpRequest,
     session: AsyncSession = Depends(get_session),
@@ -49,7 +67,9 @@ async def verify_otp(
             otp=payload.otp,
             session=session,
         )
-        return AadhaarVerifyOtpResponse(**result)
+        return FastJSONResponse(AadhaarVerifyOtpResponse(**result))
+    except InvalidTransitionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
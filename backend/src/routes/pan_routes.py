@@ -1,13 +1,26 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
+from src.cache.app_state import InvalidTransitionError
+from src.config import Config
+from src.idempotency import idempotency_claim
+from src.ratelimit import app_id, rate_limiter
+from src.telemetry.timing import TimedAPIRoute
 from src.db.main import get_session
+from src.responses import FastJSONResponse
 from src.schemas.pan_schemas import PanVerifyRequest, PanVerifyResponse
 from src.services.pan_service import PanService
 
-pan_router = APIRouter()
+pan_router = APIRouter(route_class=TimedAPIRoute)
 
-@pan_router.post("/verify", response_model=PanVerifyResponse)
+@pan_router.post(
+    "/verify",
+    response_model=PanVerifyResponse,
+    dependencies=[
+        rate_limiter.limit("verify-pan:app", Config.RATE_LIMIT_VERIFY_PAN_APP, app_id),
+        Depends(idempotency_claim),
+    ],
+)
 async def verify_pan(
     request: PanVerifyRequest,
     session: AsyncSession = Depends(get_session)
@@ -22,7 +35,9 @@ async def verify_pan(
             consent=request.consent,
             session=session
         )
-        return result
+        return FastJSONResponse(PanVerifyResponse(**result))
+    except InvalidTransitionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -1,19 +1,157 @@
+from datetime import datetime
+from typing import Literal, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from src.db.main import get_session
-from src.schemas.udyam_schemas import FinalFormRequest, FinalFormResponse
-from src.services.udyam_service import UdyamService
+from src.auth import require_admin
+from src.cache.app_state import InvalidTransitionError
+from src.config import Config
+from src.idempotency import idempotency_claim
+from src.ratelimit import app_id, rate_limiter
+from src.telemetry.timing import TimedAPIRoute
+from src.db.main import get_read_session, get_session, read_session_maker
+from src.db.pagination import InvalidCursorError
+from src.responses import FastJSONResponse
+from src.schemas.attempt_schemas import VerificationAttemptPage
+from src.schemas.import_schemas import ImportReport
+from src.schemas.udyam_schemas import (
+    ApplicationListResponse,
+    FinalFormRequest,
+    FinalFormResponse,
+)
+from src.services.attempt_service import AttemptService
+from src.services.export_service import EXPORT_FORMATS, export_bytes, export_filename
+from src.services.import_service import ImportService, iter_lines
+from src.services.udyam_service import DEFAULT_LIST_FIELDS, LISTABLE_FIELDS, UdyamService
 
-udyam_router = APIRouter()
+udyam_router = APIRouter(route_class=TimedAPIRoute)
 
-@udyam_router.post("/{app_id}/submit", response_model=FinalFormResponse)
+@udyam_router.post(
+    "/{app_id}/submit",
+    response_model=FinalFormResponse,
+    dependencies=[
+        rate_limiter.limit("submit:app", Config.RATE_LIMIT_SUBMIT_APP, app_id),
+        Depends(idempotency_claim),
+    ],
+)
 async def submit_final_form(
     app_id: UUID,
     request: FinalFormRequest,
     session: AsyncSession = Depends(get_session)
 ):
     try:
-        return await UdyamService().submit_registration(app_id, request.model_dump(), session)
+        result = await UdyamService().submit_registration(app_id, request.model_dump(), session)
+        return FastJSONResponse(FinalFormResponse(**result))
+    except InvalidTransitionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@udyam_router.get(
+    "/applications",
+    response_model=ApplicationListResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def list_applications(
+    status: Optional[str] = None,
+    type_of_organisation: Optional[str] = None,
+    pan_verified: Optional[bool] = None,
+    aadhaar_verified: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Applications newest first, filtered and projected to the requested columns.
+    Pass the returned `nextCursor` back as `cursor` to fetch the next page.
+    """
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip())) if fields else DEFAULT_LIST_FIELDS
+    unknown = [name for name in selected if name not in LISTABLE_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown) or '-'}")
+
+    try:
+        page = await UdyamService().list_applications(
+            session,
+            fields=selected,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            type_of_organisation=type_of_organisation,
+            pan_verified=pan_verified,
+            aadhaar_verified=aadhaar_verified,
+            created_from=created_from,
+            created_to=created_to,
+        )
+        return FastJSONResponse(page)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@udyam_router.get("/applications/export", dependencies=[Depends(require_admin)])
+async def export_applications(
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    status: Optional[str] = Query("submitted", description="Status to export; empty for every status"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    gzip: bool = False,
+):
+    """
+    Stream every matching application, form payload included, as a file
+    download. Rows are read through a server-side cursor and written out
+    chunk by chunk, so memory use does not grow with the export.
+    """
+    session_maker = await read_session_maker()
+    body = export_bytes(
+        session_maker,
+        format,
+        compress=gzip,
+        status=status or None,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    media_type = "application/gzip" if gzip else EXPORT_FORMATS[format][0]
+    filename = export_filename(format, gzip)
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@udyam_router.post(
+    "/applications/import",
+    response_model=ImportReport,
+    dependencies=[Depends(require_admin)],
+)
+async def import_applications(request: Request):
+    """
+    Bulk-load applications from an NDJSON body, one ApplicationImportRecord
+    per line. The body is read as it arrives and loaded in COPY chunks;
+    invalid or conflicting records are reported by line number.
+    """
+    return FastJSONResponse(await ImportService().ingest(iter_lines(request.stream())))
+
+
+@udyam_router.get("/applications/{app_id}/attempts", response_model=VerificationAttemptPage)
+async def list_verification_attempts(
+    app_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Verification attempt history for an application, newest first.
+    Pass the returned `nextCursor` back as `cursor` to fetch the next page.
+    """
+    try:
+        return FastJSONResponse(await AttemptService().list_attempts(app_id, limit, cursor, session))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+# ---------- Response Schemas ----------
+class VerificationAttemptItem(BaseModel):
+    id: UUID
+    kind: str
+    success: bool
+    message: Optional[str] = None
+    createdAt: datetime
+
+class VerificationAttemptPage(BaseModel):
+    items: list[VerificationAttemptItem]
+    nextCursor: Optional[str] = None
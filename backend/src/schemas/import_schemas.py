@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+from src.schemas.aadhaar_schemas import AadhaarSendOtpRequest
+from src.schemas.pan_schemas import PanVerifyRequest
+from src.schemas.udyam_schemas import FinalFormRequest
+
+# ---------- Request Schemas ----------
+class PanImportRecord(PanVerifyRequest):
+    # Imported rows get their id from the enclosing record.
+    appId: Optional[UUID] = None
+
+class ApplicationImportRecord(BaseModel):
+    """One NDJSON line of a bulk import: the three steps of the HTTP flow."""
+    appId: Optional[UUID] = None
+    aadhaar: AadhaarSendOtpRequest
+    # Only records that say so are imported as Aadhaar-verified.
+    aadhaarVerified: bool = False
+    pan: Optional[PanImportRecord] = None
+    form: Optional[FinalFormRequest] = None
+    createdAt: Optional[datetime] = None
+
+# ---------- Response Schemas ----------
+class ImportRecordError(BaseModel):
+    line: int
+    error: str
+
+class ImportReport(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: list[ImportRecordError]
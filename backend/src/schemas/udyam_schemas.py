@@ -1,5 +1,6 @@
 from datetime import datetime, date
 from enum import Enum
+from typing import Any, Optional
 from pydantic import BaseModel, Field, field_validator
 
 class YesNo(str, Enum):
@@ -32,3 +33,7 @@ class FinalFormRequest(BaseModel):
 class FinalFormResponse(BaseModel):
     registrationId: str
     status: str
+
+class ApplicationListResponse(BaseModel):
+    items: list[dict[str, Any]]
+    nextCursor: Optional[str] = None
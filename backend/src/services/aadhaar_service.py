@@ -1,11 +1,68 @@
 from datetime import datetime
-from sqlmodel import select
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import text
+from sqlmodel import update
 from sqlmodel.ext.asyncio.session import AsyncSession
+from src.cache.app_state import STATE_COLUMNS, app_state_cache, parse_app_id, step_condition
+from src.db.audit import audit_writer
+from src.db.ids import uuid7
 from src.db.models import UdyamApplication, VerificationAttempt
 import hashlib
 import uuid
 
 
+def draft_upsert(aadhaar_number: str, entrepreneur_name: str, consent: bool):
+    """Insert a draft for this Aadhaar, or reuse the open one, so that
+    re-sending an OTP doesn't create a new application each time.
+
+    Reusing a draft resets its verification: whoever asked for the new
+    OTP has to verify it (and then the PAN) again, otherwise knowing an
+    Aadhaar number would be enough to take over a verified draft."""
+    # Mask & hash Aadhaar for storage
+    stmt = (
+        pg.insert(UdyamApplication)
+        .values(
+            id=uuid7(),
+            entrepreneur_name=entrepreneur_name,
+            aadhaar_last4=aadhaar_number[-4:],
+            aadhaar_hash=hashlib.sha256(aadhaar_number.encode()).hexdigest(),
+            aadhaar_consent=consent,
+            status="draft",
+            form_payload={},
+        )
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[UdyamApplication.aadhaar_hash],
+        # Must be a literal: once asyncpg switches the prepared statement
+        # to a generic plan, a bound parameter no longer matches the
+        # partial index and Postgres rejects the ON CONFLICT target.
+        index_where=text("status = 'draft'"),
+        set_={
+            "entrepreneur_name": stmt.excluded.entrepreneur_name,
+            "aadhaar_consent": stmt.excluded.aadhaar_consent,
+            "updated_at": stmt.excluded.updated_at,
+            "aadhaar_verified": False,
+            "aadhaar_verified_at": None,
+            "pan_verified": False,
+            "pan_verified_at": None,
+            "version": UdyamApplication.version + 1,
+        },
+    ).returning(*STATE_COLUMNS)
+
+
+def verify_otp_update(app_id: uuid.UUID):
+    return (
+        update(UdyamApplication)
+        .where(UdyamApplication.id == app_id, step_condition("verify_otp"))
+        .values(
+            aadhaar_verified=True,
+            aadhaar_verified_at=datetime.utcnow(),
+            version=UdyamApplication.version + 1,
+        )
+        .returning(*STATE_COLUMNS)
+    )
+
+
 class AadhaarService:
     async def send_otp(
         self,
@@ -14,63 +71,54 @@ class AadhaarService:
         consent: bool,
         session: AsyncSession,
     ):
-        # Mask & hash Aadhaar for storage
         aadhaar_last4 = aadhaar_number[-4:]
-        aadhaar_hash = hashlib.sha256(aadhaar_number.encode()).hexdigest()
-
-        app = UdyamApplication(
-            entrepreneur_name=entrepreneur_name,
-            aadhaar_last4=aadhaar_last4,
-            aadhaar_hash=aadhaar_hash,
-            aadhaar_consent=consent,
-            status="draft",
-        )
-
-        session.add(app)
-        await session.commit()
-        await session.refresh(app)
+        stmt = draft_upsert(aadhaar_number, entrepreneur_name, consent)
+        row = (await session.exec(stmt)).one()
+        app_id = row.id
 
         # Simulate OTP sending (fake)
         transaction_id = str(uuid.uuid4())
 
         attempt = VerificationAttempt(
-            app_id=app.id,
+            id=uuid.uuid4(),
+            app_id=app_id,
             kind="aadhaar_otp",
             success=True,
             payload={"transaction_id": transaction_id, "otp_sent": True},
         )
 
-        session.add(attempt)
-        await session.commit()
+        await audit_writer.commit_and_record(session, attempt)
+        # A resend may have reset a verified draft; replace what was cached.
+        app_state_cache.discard(app_id)
+        app_state_cache.put_row(row, inserted=True)
 
         return {
             "transactionId": transaction_id,
             "otpSentTo": f"****{aadhaar_last4}",
-            "appId": str(app.id),
+            "appId": str(app_id),
         }
 
     async def verify_otp(
         self, app_id: uuid.UUID, transaction_id: str, otp: str, session: AsyncSession
     ):
-        # Simulated success
-        stmt = select(UdyamApplication).where(UdyamApplication.id == app_id)
-        app = (await session.exec(stmt)).first()
+        app_id = parse_app_id(app_id)
+        app_state_cache.guard(app_id, "verify_otp")
 
-        if not app:
-            raise ValueError("Application not found")
+        # Simulated success
+        row = (await session.exec(verify_otp_update(app_id))).first()
 
-        app.aadhaar_verified = True
-        app.aadhaar_verified_at = datetime.utcnow()
-        await session.commit()
+        if row is None:
+            raise await app_state_cache.explain_failure(session, app_id, "verify_otp")
+        updated_id = row.id
 
         attempt = VerificationAttempt(
-            app_id=app.id,
+            app_id=updated_id,
             kind="aadhaar_otp",
             success=True,
             payload={"transaction_id": transaction_id, "otp": otp},
             message="OTP verified successfully",
         )
-        session.add(attempt)
-        await session.commit()
+        await audit_writer.commit_and_record(session, attempt)
+        app_state_cache.put_row(row)
 
-        return {"verified": True, "appId": str(app.id)}
+        return {"verified": True, "appId": str(updated_id)}
@@ -0,0 +1,48 @@
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.db.models import UdyamApplication, VerificationAttempt
+from src.db.pagination import seek_before, split_page
+
+
+def attempts_query(app_id, limit: int, cursor: str | None):
+    stmt = select(
+        VerificationAttempt.id,
+        VerificationAttempt.kind,
+        VerificationAttempt.success,
+        VerificationAttempt.message,
+        VerificationAttempt.created_at,
+    ).where(VerificationAttempt.app_id == app_id)
+    return seek_before(
+        stmt, VerificationAttempt.created_at, VerificationAttempt.id, cursor
+    ).limit(limit + 1)
+
+
+class AttemptService:
+    async def list_attempts(
+        self, app_id, limit: int, cursor: str | None, session: AsyncSession
+    ):
+        stmt = attempts_query(app_id, limit, cursor)
+        rows = (await session.exec(stmt)).all()
+
+        # An empty first page is the only case where we need to tell
+        # "no attempts yet" apart from "no such application".
+        if not rows and cursor is None:
+            exists = select(UdyamApplication.id).where(UdyamApplication.id == app_id)
+            if (await session.exec(exists)).first() is None:
+                raise ValueError("Application not found")
+
+        page, next_cursor = split_page(rows, limit)
+
+        return {
+            "items": [
+                {
+                    "id": row.id,
+                    "kind": row.kind,
+                    "success": row.success,
+                    "message": row.message,
+                    "createdAt": row.created_at,
+                }
+                for row in page
+            ],
+            "nextCursor": next_cursor,
+        }
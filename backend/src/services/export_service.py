@@ -0,0 +1,198 @@
+import csv
+import io
+import json
+import uuid
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import Config
+from src.db.models import UdyamApplication, naive_utc
+from src.services.udyam_service import LISTABLE_FIELDS
+
+# Everything the listing exposes plus the submitted form itself.
+EXPORT_FIELDS = (*LISTABLE_FIELDS, "form_payload")
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialise {type(value).__name__}")
+
+
+class ExportService:
+    async def stream_applications(
+        self,
+        session: AsyncSession,
+        status: str | None = "submitted",
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        chunk_size: int = Config.EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield applications `chunk_size` rows at a time.
+
+        Rows come from a server-side cursor, so only one chunk is held in
+        memory however large the table is.
+        """
+        stmt = select(*(getattr(UdyamApplication, name) for name in EXPORT_FIELDS))
+        if status is not None:
+            stmt = stmt.where(UdyamApplication.status == status)
+        if created_from is not None:
+            stmt = stmt.where(UdyamApplication.created_at >= naive_utc(created_from))
+        if created_to is not None:
+            stmt = stmt.where(UdyamApplication.created_at < naive_utc(created_to))
+        stmt = stmt.order_by(UdyamApplication.created_at, UdyamApplication.id)
+
+        result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for rows in result.mappings().partitions():
+            yield [dict(row) for row in rows]
+
+
+async def encode_ndjson(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    async for rows in chunks:
+        yield "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in rows
+        ).encode()
+
+
+async def encode_csv(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    async for rows in chunks:
+        for row in rows:
+            payload = row.get("form_payload")
+            if payload is not None:
+                row = {**row, "form_payload": json.dumps(payload, default=_json_default, ensure_ascii=False)}
+            writer.writerow(row)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last take()."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def encode_parquet(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    """One Parquet row group per chunk, flushed as soon as it is written."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow") from e
+
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("entrepreneur_name", pa.string()),
+            ("aadhaar_last4", pa.string()),
+            ("aadhaar_verified", pa.bool_()),
+            ("aadhaar_verified_at", pa.timestamp("us")),
+            ("pan_masked", pa.string()),
+            ("pan_holder_name", pa.string()),
+            ("dob_or_doi", pa.date32()),
+            ("type_of_organisation", pa.string()),
+            ("previous_year_itr_filed", pa.bool_()),
+            ("has_gstin_status", pa.string()),
+            ("pan_verified", pa.bool_()),
+            ("pan_verified_at", pa.timestamp("us")),
+            ("status", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+            ("form_payload", pa.string()),
+        ]
+    )
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for rows in chunks:
+            columns = {name: [row[name] for row in rows] for name in EXPORT_FIELDS}
+            columns["id"] = [str(value) for value in columns["id"]]
+            columns["form_payload"] = [
+                None if value is None else json.dumps(value, default=_json_default, ensure_ascii=False)
+                for value in columns["form_payload"]
+            ]
+            writer.write_table(pa.table(columns, schema=schema))
+            data = sink.take()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+    "parquet": encode_parquet,
+}
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def export_bytes(
+    session_maker,
+    format: str,
+    compress: bool = False,
+    **filters,
+) -> AsyncIterator[bytes]:
+    """Encoded export stream that owns its session for as long as it runs.
+
+    A route can't lend its request-scoped session here: FastAPI closes
+    dependencies before a StreamingResponse body is sent.
+    """
+    async with session_maker() as session:
+        stream = ENCODERS[format](ExportService().stream_applications(session, **filters))
+        if compress:
+            stream = gzip_stream(stream)
+        async for chunk in stream:
+            yield chunk
+
+
+def export_filename(format: str, compress: bool, today: date | None = None) -> str:
+    today = today or date.today()
+    name = f"udyam_applications_{today:%Y%m%d}.{EXPORT_FORMATS[format][1]}"
+    return name + ".gz" if compress else name
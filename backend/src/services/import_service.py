@@ -0,0 +1,219 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator
+
+import asyncpg
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from src.cache.app_ids import app_id_filter
+from src.config import Config
+from src.db.ids import uuid7
+from src.schemas.import_schemas import ApplicationImportRecord
+from src.services.udyam_service import form_values
+
+STAGE_TABLE = "udyam_applications_import"
+
+COPY_COLUMNS = (
+    "id",
+    "entrepreneur_name",
+    "aadhaar_last4",
+    "aadhaar_hash",
+    "aadhaar_consent",
+    "aadhaar_verified",
+    "aadhaar_verified_at",
+    "pan_masked",
+    "pan_hash",
+    "pan_holder_name",
+    "dob_or_doi",
+    "type_of_organisation",
+    "previous_year_itr_filed",
+    "has_gstin_status",
+    "pan_verified",
+    "pan_verified_at",
+    "status",
+    "form_payload",
+    "created_at",
+    "updated_at",
+)
+
+# Session-local staging table, reused by every chunk on the connection.
+_CREATE_STAGE = text(
+    f"CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} "
+    "(LIKE udyam_applications INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+)
+
+# Rows that would break a unique constraint (an existing id, or a second
+# open draft for the same Aadhaar) are skipped and reported, not fatal.
+_MERGE_STAGE = text(
+    f"INSERT INTO udyam_applications ({', '.join(COPY_COLUMNS)}) "
+    f"SELECT {', '.join(COPY_COLUMNS)} FROM {STAGE_TABLE} "
+    "ON CONFLICT DO NOTHING RETURNING id"
+)
+
+
+def sha256_hex(values: list[str]) -> list[str]:
+    return [hashlib.sha256(value.encode()).hexdigest() for value in values]
+
+
+def mask_pan(pan_number: str) -> str:
+    return pan_number[:5] + "*****" + pan_number[-1:]
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'record'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def build_rows(records: list[ApplicationImportRecord], now: datetime | None = None) -> list[tuple]:
+    """COPY-ready tuples for validated records, in COPY_COLUMNS order.
+
+    Identifiers are hashed and masked for the whole batch in one pass
+    before any row is assembled.
+    """
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    aadhaar_hashes = sha256_hex([r.aadhaar.aadhaarNumber for r in records])
+    pans = [r.pan.panNumber if r.pan else None for r in records]
+    pan_hashes = iter(sha256_hex([p for p in pans if p is not None]))
+
+    rows = []
+    for record, aadhaar_hash, pan_number in zip(records, aadhaar_hashes, pans):
+        created_at = record.createdAt or now
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+        form = form_values(record.form.model_dump()) if record.form else {}
+        gstin = form.get("has_gstin_status")
+        pan = record.pan
+
+        values = {
+            "id": record.appId or uuid7(),
+            "entrepreneur_name": form.get("entrepreneur_name") or record.aadhaar.entrepreneurName,
+            "aadhaar_last4": record.aadhaar.aadhaarNumber[-4:],
+            "aadhaar_hash": aadhaar_hash,
+            "aadhaar_consent": record.aadhaar.consent,
+            "aadhaar_verified": record.aadhaarVerified,
+            "aadhaar_verified_at": created_at if record.aadhaarVerified else None,
+            "pan_masked": mask_pan(pan_number) if pan else None,
+            "pan_hash": next(pan_hashes) if pan else None,
+            "pan_holder_name": pan.panHolderName if pan else None,
+            "dob_or_doi": form.get("dob_or_doi") or (pan.dobOrDoi if pan else None),
+            "type_of_organisation": form.get("type_of_organisation"),
+            "previous_year_itr_filed": form.get("previous_year_itr_filed"),
+            "has_gstin_status": gstin.value if gstin is not None else None,
+            "pan_verified": pan is not None,
+            "pan_verified_at": created_at if pan else None,
+            "status": "submitted" if record.form else "draft",
+            "form_payload": json.dumps(form.get("form_payload", {})),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        rows.append(tuple(values[name] for name in COPY_COLUMNS))
+    return rows
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without holding more than one partial line."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+class ImportService:
+    """Bulk-load applications from NDJSON.
+
+    Records are validated one by one, then loaded `chunk_size` at a time
+    with COPY into a staging table and merged into udyam_applications,
+    each chunk in its own transaction.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        chunk_size: int = Config.IMPORT_CHUNK_SIZE,
+        max_reported_errors: int = Config.IMPORT_MAX_REPORTED_ERRORS,
+    ) -> None:
+        self._engine = engine
+        self.chunk_size = chunk_size
+        self.max_reported_errors = max_reported_errors
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from src.db.main import async_engine
+
+            self._engine = async_engine
+        return self._engine
+
+    async def ingest(self, lines: AsyncIterable[bytes | str]) -> dict:
+        report = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+        batch: list[tuple[int, ApplicationImportRecord]] = []
+
+        line_no = 0
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            report["received"] += 1
+            try:
+                batch.append((line_no, ApplicationImportRecord.model_validate_json(line)))
+            except ValidationError as e:
+                self._fail(report, line_no, format_validation_error(e))
+                continue
+            if len(batch) >= self.chunk_size:
+                await self._load(batch, report)
+                batch = []
+
+        if batch:
+            await self._load(batch, report)
+        return report
+
+    async def _load(self, batch: list[tuple[int, ApplicationImportRecord]], report: dict) -> None:
+        rows = build_rows([record for _, record in batch])
+        await self._copy(list(zip((line_no for line_no, _ in batch), rows)), report)
+
+    async def _copy(self, rows: list[tuple[int, tuple]], report: dict) -> None:
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(_CREATE_STAGE)
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    STAGE_TABLE, records=[row for _, row in rows], columns=COPY_COLUMNS
+                )
+                inserted = set((await conn.execute(_MERGE_STAGE)).scalars())
+        except (DBAPIError, asyncpg.PostgresError) as e:
+            # One bad row aborts the whole COPY; halve the chunk until the
+            # offending rows are isolated and everything else is loaded.
+            if len(rows) > 1:
+                middle = len(rows) // 2
+                await self._copy(rows[:middle], report)
+                await self._copy(rows[middle:], report)
+            else:
+                error = e.orig if isinstance(e, DBAPIError) else e
+                self._fail(report, rows[0][0], str(error).splitlines()[0])
+            return
+
+        report["inserted"] += len(inserted)
+        # Only clears this process's negative cache: other workers (and
+        # every worker, for CLI imports) may keep answering 404 for an
+        # imported id they recently saw missing, for up to
+        # APP_ID_NEGATIVE_CACHE_TTL seconds.
+        for app_id in inserted:
+            app_id_filter.add(app_id)
+        for line_no, row in rows:
+            if row[0] not in inserted:
+                self._fail(report, line_no, "conflicts with an existing application")
+
+    def _fail(self, report: dict, line_no: int, error: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < self.max_reported_errors:
+            report["errors"].append({"line": line_no, "error": error})
@@ -1,10 +1,29 @@
 from datetime import datetime
-from sqlmodel import select
+from sqlmodel import update
 from sqlmodel.ext.asyncio.session import AsyncSession
+from src.cache.app_state import STATE_COLUMNS, app_state_cache, parse_app_id, step_condition
+from src.db.audit import audit_writer
 from src.db.models import UdyamApplication, VerificationAttempt
 import hashlib
 
 
+def verify_pan_update(app_id, pan_masked: str, pan_hash: str, pan_holder_name, dob_or_doi):
+    return (
+        update(UdyamApplication)
+        .where(UdyamApplication.id == app_id, step_condition("verify_pan"))
+        .values(
+            pan_masked=pan_masked,
+            pan_hash=pan_hash,
+            pan_holder_name=pan_holder_name,
+            dob_or_doi=dob_or_doi,
+            pan_verified=True,
+            pan_verified_at=datetime.utcnow(),
+            version=UdyamApplication.version + 1,
+        )
+        .returning(*STATE_COLUMNS)
+    )
+
+
 class PanService:
     async def verify_pan(
         self,
@@ -15,30 +34,26 @@ class PanService:
         consent,
         session: AsyncSession,
     ):
-        stmt = select(UdyamApplication).where(UdyamApplication.id == app_id)
-        app = (await session.exec(stmt)).first()
-        if not app:
-            raise ValueError("Application not found")
+        app_id = parse_app_id(app_id)
+        app_state_cache.guard(app_id, "verify_pan")
 
         pan_masked = pan_number[:5] + "*****" + pan_number[-1:]
         pan_hash = hashlib.sha256(pan_number.encode()).hexdigest()
 
-        app.pan_masked = pan_masked
-        app.pan_hash = pan_hash
-        app.pan_holder_name = pan_holder_name
-        app.dob_or_doi = dob_or_doi
-        app.pan_verified = True
-        app.pan_verified_at = datetime.utcnow()
-        await session.commit()
+        stmt = verify_pan_update(app_id, pan_masked, pan_hash, pan_holder_name, dob_or_doi)
+        row = (await session.exec(stmt)).first()
+        if row is None:
+            raise await app_state_cache.explain_failure(session, app_id, "verify_pan")
+        updated_id = row.id
 
         attempt = VerificationAttempt(
-            app_id=app.id,
+            app_id=updated_id,
             kind="pan",
             success=True,
             payload={"pan_number": pan_masked},
             message="PAN verified (simulated)",
         )
-        session.add(attempt)
-        await session.commit()
+        await audit_writer.commit_and_record(session, attempt)
+        app_state_cache.put_row(row)
 
-        return {"verified": True, "appId": str(app.id)}
+        return {"verified": True, "appId": str(updated_id)}
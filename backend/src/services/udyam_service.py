@@ -1,7 +1,9 @@
 from datetime import datetime, date
-from sqlmodel import select
+from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
-from src.db.models import UdyamApplication, GSTINStatus, YesNo
+from src.cache.app_state import STATE_COLUMNS, app_state_cache, parse_app_id, step_condition
+from src.db.models import UdyamApplication, GSTINStatus, YesNo, naive_utc
+from src.db.pagination import seek_before, split_page
 from enum import Enum
 
 TYPE_OF_ORGANISATION_MAP = {
@@ -18,6 +20,29 @@ TYPE_OF_ORGANISATION_MAP = {
     "8": "Others / अन्य",
 }
 
+# Columns the listing endpoint may project; hashes and the raw form
+# payload are deliberately left out.
+LISTABLE_FIELDS = (
+    "id",
+    "entrepreneur_name",
+    "aadhaar_last4",
+    "aadhaar_verified",
+    "aadhaar_verified_at",
+    "pan_masked",
+    "pan_holder_name",
+    "dob_or_doi",
+    "type_of_organisation",
+    "previous_year_itr_filed",
+    "has_gstin_status",
+    "pan_verified",
+    "pan_verified_at",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+DEFAULT_LIST_FIELDS = ("id", "entrepreneur_name", "status", "created_at")
+
 def make_json_safe(data: dict):
     """Convert Enums and dates to JSON-serializable values."""
     def convert(value):
@@ -32,43 +57,125 @@ def make_json_safe(data: dict):
         return value
     return convert(data)
 
-class UdyamService:
-    async def submit_registration(self, app_id, form_payload: dict, session: AsyncSession):
-        stmt = select(UdyamApplication).where(UdyamApplication.id == app_id)
-        app = (await session.exec(stmt)).first()
+def form_values(form_payload: dict) -> dict:
+    """Column values for a submitted final form."""
+    # Entrepreneur name
+    values = {"entrepreneur_name": form_payload.get("entrepreneurName")}
+
+    # Map type_of_organisation from numeric to text
+    org_value = form_payload.get("typeOfOrganisation")
+    if org_value in TYPE_OF_ORGANISATION_MAP:
+        values["type_of_organisation"] = TYPE_OF_ORGANISATION_MAP[org_value]
+    else:
+        values["type_of_organisation"] = org_value
+
+    # DOB / DOI
+    values["dob_or_doi"] = form_payload.get("dobOrDoi")
+
+    # Previous year ITR
+    prev_itr = form_payload.get("previousYearITR")
+    if prev_itr in (YesNo.YES.value, YesNo.NO.value):
+        values["previous_year_itr_filed"] = (prev_itr == YesNo.YES.value)
 
-        if not app:
-            raise ValueError("Application not found")
+    # GSTIN status
+    gst = form_payload.get("hasGSTIN")
+    if gst in (GSTINStatus.YES.value, GSTINStatus.NO.value, GSTINStatus.EXEMPTED.value):
+        values["has_gstin_status"] = GSTINStatus(gst)
 
-        # Entrepreneur name
-        app.entrepreneur_name = form_payload.get("entrepreneurName")
+    # ✅ Store JSON-safe payload
+    values["form_payload"] = make_json_safe(form_payload)
 
-        # Map type_of_organisation from numeric to text
-        org_value = form_payload.get("typeOfOrganisation")
-        if org_value in TYPE_OF_ORGANISATION_MAP:
-            app.type_of_organisation = TYPE_OF_ORGANISATION_MAP[org_value]
-        else:
-            app.type_of_organisation = org_value
+    return values
 
-        # DOB / DOI
-        app.dob_or_doi = form_payload.get("dobOrDoi")
+def submit_update(app_id, form_payload: dict):
+    values = form_values(form_payload)
+    values["status"] = "submitted"
+    values["updated_at"] = datetime.utcnow()
+    values["version"] = UdyamApplication.version + 1
 
-        # Previous year ITR
-        prev_itr = form_payload.get("previousYearITR")
-        if prev_itr in (YesNo.YES.value, YesNo.NO.value):
-            app.previous_year_itr_filed = (prev_itr == YesNo.YES.value)
+    return (
+        update(UdyamApplication)
+        .where(UdyamApplication.id == app_id, step_condition("submit"))
+        .values(**values)
+        .returning(*STATE_COLUMNS)
+    )
 
-        # GSTIN status
-        gst = form_payload.get("hasGSTIN")
-        if gst in (GSTINStatus.YES.value, GSTINStatus.NO.value, GSTINStatus.EXEMPTED.value):
-            app.has_gstin_status = GSTINStatus(gst)
+def applications_query(
+    fields: tuple[str, ...] = DEFAULT_LIST_FIELDS,
+    limit: int = 20,
+    cursor: str | None = None,
+    status: str | None = None,
+    type_of_organisation: str | None = None,
+    pan_verified: bool | None = None,
+    aadhaar_verified: bool | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+):
+    # id and created_at are always read because the cursor is built from them.
+    columns = dict.fromkeys(("id", "created_at", *fields))
+    stmt = select(*(getattr(UdyamApplication, name) for name in columns))
 
-        # ✅ Store JSON-safe payload
-        app.form_payload = make_json_safe(form_payload)
+    if status is not None:
+        stmt = stmt.where(UdyamApplication.status == status)
+    if type_of_organisation is not None:
+        stmt = stmt.where(UdyamApplication.type_of_organisation == type_of_organisation)
+    if pan_verified is not None:
+        stmt = stmt.where(UdyamApplication.pan_verified == pan_verified)
+    if aadhaar_verified is not None:
+        stmt = stmt.where(UdyamApplication.aadhaar_verified == aadhaar_verified)
+    if created_from is not None:
+        stmt = stmt.where(UdyamApplication.created_at >= naive_utc(created_from))
+    if created_to is not None:
+        stmt = stmt.where(UdyamApplication.created_at < naive_utc(created_to))
 
-        app.status = "submitted"
-        app.updated_at = datetime.utcnow()
+    # One extra row tells whether there is a next page.
+    return seek_before(
+        stmt, UdyamApplication.created_at, UdyamApplication.id, cursor
+    ).limit(limit + 1)
+
+class UdyamService:
+    async def submit_registration(self, app_id, form_payload: dict, session: AsyncSession):
+        app_id = parse_app_id(app_id)
+        app_state_cache.guard(app_id, "submit")
+
+        row = (await session.exec(submit_update(app_id, form_payload))).first()
+
+        if row is None:
+            raise await app_state_cache.explain_failure(session, app_id, "submit")
 
         await session.commit()
+        app_state_cache.put_row(row)
+
+        return {"registrationId": str(row.id), "status": row.status}
+
+    async def list_applications(
+        self,
+        session: AsyncSession,
+        fields: tuple[str, ...] = DEFAULT_LIST_FIELDS,
+        limit: int = 20,
+        cursor: str | None = None,
+        status: str | None = None,
+        type_of_organisation: str | None = None,
+        pan_verified: bool | None = None,
+        aadhaar_verified: bool | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ):
+        stmt = applications_query(
+            fields,
+            limit,
+            cursor,
+            status,
+            type_of_organisation,
+            pan_verified,
+            aadhaar_verified,
+            created_from,
+            created_to,
+        )
+        rows = (await session.exec(stmt)).all()
+        page, next_cursor = split_page(rows, limit)
 
-        return {"registrationId": str(app.id), "status": app.status}
+        return {
+            "items": [{name: getattr(row, name) for name in fields} for row in page],
+            "nextCursor": next_cursor,
+        }
@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+
+from src.idempotency import _read_body
+
+logger = logging.getLogger(__name__)
+
+# POST routes whose concurrent duplicates share one execution, matched
+# against the end of the path. Each carries its app_id either in the
+# path (submit) or in the body (the verify steps), so the path plus a
+# hash of the body identifies the route, application and payload.
+COALESCED_ROUTES = ("/verify-otp", "/pan/verify", "/submit")
+
+
+@dataclass
+class SharedResponse:
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+def coalesce_key(path: str, body: bytes) -> str:
+    return f"{path}\n{hashlib.sha256(body).hexdigest()}"
+
+
+class SingleFlight:
+    """Executions currently running, by coalesce key."""
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def join(self, key: str) -> asyncio.Future | None:
+        """The running execution for `key`, or None after registering the
+        caller as the one to run it."""
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future
+        self._calls[key] = asyncio.get_running_loop().create_future()
+        return None
+
+    def finish(self, key: str, response: SharedResponse | None) -> None:
+        """Hand `response` to every waiter; None means the execution failed."""
+        self._calls.pop(key).set_result(response)
+
+
+class SingleFlightMiddleware:
+    """Concurrent identical POSTs to COALESCED_ROUTES run once.
+
+    The first request runs normally; duplicates that arrive while it is
+    running wait for it and get a copy of its response, marked with a
+    `coalesced: true` header. Only simultaneous requests are merged:
+    one that arrives after the first finished runs on its own.
+    """
+
+    def __init__(self, app, flights: SingleFlight) -> None:
+        self.app = app
+        self.flights = flights
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].endswith(COALESCED_ROUTES):
+            return await self.app(scope, receive, send)
+
+        body = await _read_body(receive)
+        key = coalesce_key(scope["path"], body)
+
+        running = self.flights.join(key)
+        if running is not None:
+            # Shielded so a waiter's disconnect doesn't cancel the shared result.
+            shared = await asyncio.shield(running)
+            if shared is not None:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": shared.status_code,
+                        "headers": shared.headers + [(b"coalesced", b"true")],
+                    }
+                )
+                await send({"type": "http.response.body", "body": shared.body})
+                return
+            # The first execution blew up; this one gets its own try.
+            logger.warning("Coalesced request failed, running duplicate separately")
+            return await self._call(scope, body, receive, send)
+
+        status_code = 500
+        headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def capture_send(message):
+            nonlocal status_code, headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        response = None
+        try:
+            await self._call(scope, body, receive, capture_send)
+            response = SharedResponse(status_code, headers, b"".join(chunks))
+        finally:
+            self.flights.finish(key, response)
+
+    async def _call(self, scope, body, receive, send):
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,123 @@
+import hashlib
+from pathlib import Path
+from typing import Callable
+
+import orjson
+from fastapi import FastAPI, Request, Response
+
+from src.compression import ENCODINGS, choose_encoding, compress
+
+FORM_SCHEMA_PATH = Path(__file__).parent / "static" / "udyam_form_schema.json"
+
+# A URL carrying the content hash always names the same bytes.
+IMMUTABLE = "public, max-age=31536000, immutable"
+# The plain URL is revalidated every time, which the ETag makes a 304.
+REVALIDATE = "public, no-cache"
+
+
+def _etag_values(header: str) -> set[str]:
+    return {tag.strip().removeprefix("W/").strip('"') for tag in header.split(",")}
+
+
+class StaticAsset:
+    """A document rendered once, with its compressed variants and hash.
+
+    Each encoding is its own representation, so it gets its own ETag;
+    any of them in If-None-Match means the client has this version.
+    """
+
+    def __init__(self, body: bytes, media_type: str) -> None:
+        self.body = body
+        self.media_type = media_type
+        self.version = hashlib.sha256(body).hexdigest()[:16]
+        self.variants: dict[str, bytes] = {}
+        for encoding in ENCODINGS:
+            data = compress(body, encoding)
+            if len(data) < len(body):
+                self.variants[encoding] = data
+        self._etags = {self.version} | {f"{self.version}-{e}" for e in self.variants}
+
+    def etag(self, encoding: str | None = None) -> str:
+        return f'"{self.version}-{encoding}"' if encoding else f'"{self.version}"'
+
+    def response(self, request: Request) -> Response:
+        encoding = choose_encoding(request.headers.get("accept-encoding"), tuple(self.variants))
+        headers = {
+            "ETag": self.etag(encoding),
+            "Vary": "Accept-Encoding",
+            "Cache-Control": IMMUTABLE if request.query_params.get("v") == self.version else REVALIDATE,
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or _etag_values(if_none_match) & self._etags):
+            return Response(status_code=304, headers=headers)
+
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            return Response(self.variants[encoding], media_type=self.media_type, headers=headers)
+        return Response(self.body, media_type=self.media_type, headers=headers)
+
+
+class StaticAssets:
+    """Named documents built once, normally from the lifespan.
+
+    Anything not built yet is built on first request, so an app
+    started without its lifespan still serves them.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[str, tuple[Callable[[], bytes], str]] = {}
+        self._assets: dict[str, StaticAsset] = {}
+
+    def register(self, name: str, source: Callable[[], bytes], media_type: str = "application/json") -> None:
+        self._sources[name] = (source, media_type)
+        self._assets.pop(name, None)
+
+    def build(self) -> None:
+        for name in self._sources:
+            self.get(name)
+
+    def get(self, name: str) -> StaticAsset:
+        asset = self._assets.get(name)
+        if asset is None:
+            source, media_type = self._sources[name]
+            asset = self._assets[name] = StaticAsset(source(), media_type)
+        return asset
+
+    def versions(self) -> dict[str, str]:
+        return {name: asset.version for name, asset in self._assets.items()}
+
+
+static_assets = StaticAssets()
+
+
+def load_form_schema() -> bytes:
+    return orjson.dumps(orjson.loads(FORM_SCHEMA_PATH.read_bytes()))
+
+
+def register_static_assets(app: FastAPI, prefix: str) -> None:
+    """Serve the OpenAPI document and the form schema from static_assets.
+
+    Call after every route is included: the OpenAPI document is built
+    from the routes as they stand at startup.
+    """
+    static_assets.register("openapi", lambda: orjson.dumps(app.openapi()))
+    static_assets.register("udyam-form", load_form_schema)
+
+    # Swap FastAPI's own handler, which re-serializes the schema per request.
+    app.router.routes[:] = [
+        route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url
+    ]
+
+    async def openapi(request: Request) -> Response:
+        return static_assets.get("openapi").response(request)
+
+    app.add_route(app.openapi_url, openapi, include_in_schema=False)
+
+    @app.get(f"{prefix}/schemas/udyam-form.json", tags=["Schemas"])
+    async def udyam_form_schema(request: Request):
+        """
+        Field definitions for every step of the registration form.
+        Append `?v=<ETag hash>` for a URL that may be cached indefinitely.
+        """
+        return static_assets.get("udyam-form").response(request)
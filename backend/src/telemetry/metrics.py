@@ -0,0 +1,163 @@
+import os
+import time
+from collections import defaultdict
+
+from src.db.pool import pool_status
+from src.telemetry.histogram import Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency buckets in milliseconds, exposed in seconds.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Set by src.commands.serve: the worker's slot, kept by its replacements.
+WORKER_ENV = "SERVER_WORKER_INDEX"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metrics:
+    """In-process counters for this worker.
+
+    Everything is updated from the event loop thread with plain dict and
+    integer operations, so recording takes no locks. Each worker
+    reports its own values under a `worker` label holding its slot
+    number, which a worker started to replace a retired one reuses (its
+    counters restart from zero, which Prometheus reads as a reset).
+    Workers are scraped one by one on their own metrics ports, since
+    the shared API port reaches whichever worker accepts first.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, int], int] = defaultdict(int)
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.attempts: dict[tuple[str, bool], int] = defaultdict(int)
+
+    def observe_request(self, route: str, method: str, status_code: int, duration_ms: float) -> None:
+        self.requests[route, method, status_code] += 1
+        histogram = self.latency.get((route, method))
+        if histogram is None:
+            histogram = self.latency[route, method] = Histogram(LATENCY_BUCKETS_MS)
+        histogram.observe(duration_ms)
+
+    def observe_attempt(self, kind: str, success: bool) -> None:
+        self.attempts[kind, bool(success)] += 1
+
+    def render(self, gauges: list[tuple[str, str, str, dict, float]] = ()) -> str:
+        """Text exposition of the counters plus extra (name, type, help,
+        labels, value) samples collected at scrape time."""
+        worker = os.environ.get(WORKER_ENV, "0")
+        lines = [
+            "# HELP http_requests_total HTTP requests by route template, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status_code), count in sorted(self.requests.items()):
+            labels = _labels(route=route, method=method, status=status_code, worker=worker)
+            lines.append(f"http_requests_total{labels} {count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds HTTP request latency by route template and method.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (route, method), histogram in sorted(self.latency.items()):
+            for bound, count in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else _number(bound / 1000)
+                labels = _labels(route=route, method=method, worker=worker, le=le)
+                lines.append(f"http_request_duration_seconds_bucket{labels} {count}")
+            labels = _labels(route=route, method=method, worker=worker)
+            lines.append(f"http_request_duration_seconds_sum{labels} {_number(histogram.sum / 1000)}")
+            lines.append(f"http_request_duration_seconds_count{labels} {histogram.count}")
+
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight{_labels(worker=worker)} {self.in_flight}",
+            "# HELP verification_attempts_total Verification attempts recorded, by kind and outcome.",
+            "# TYPE verification_attempts_total counter",
+        ]
+        for (kind, success), count in sorted(self.attempts.items()):
+            labels = _labels(kind=kind, success=str(success).lower(), worker=worker)
+            lines.append(f"verification_attempts_total{labels} {count}")
+
+        # Samples of one family must be contiguous in the exposition.
+        families: dict[str, list] = {}
+        for sample in gauges:
+            families.setdefault(sample[0], []).append(sample)
+        for name, samples in families.items():
+            lines.append(f"# HELP {name} {samples[0][2]}")
+            lines.append(f"# TYPE {name} {samples[0][1]}")
+            for _, _, _, labels, value in samples:
+                lines.append(f"{name}{_labels(**labels, worker=worker)} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Counts requests, in-flight requests and latency per route template."""
+
+    def __init__(self, app, metrics: Metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metrics = self.metrics
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            metrics.observe_request(
+                route, scope["method"], status_code, (time.perf_counter_ns() - start) / 1e6
+            )
+
+
+def pool_samples(pool: str, engine) -> list[tuple[str, str, str, dict, float]]:
+    """Scrape-time samples for one engine's connection pool."""
+    status = pool_status(engine)
+    labels = {"pool": pool}
+    samples = [
+        ("db_pool_size", "gauge", "Connections the pool keeps open.", labels, status["size"]),
+        ("db_pool_checked_out", "gauge", "Connections currently checked out.", labels, status["checked_out"]),
+        ("db_pool_overflow", "gauge", "Connections open beyond the pool size.", labels, status["overflow"]),
+    ]
+    stats = getattr(engine.pool, "stats", None)
+    if stats is not None:
+        samples += [
+            ("db_pool_checkouts_total", "counter", "Connection checkouts.", labels, stats.checkouts),
+            ("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.", labels, stats.timeouts),
+            ("db_pool_wait_seconds_total", "counter", "Time spent waiting for connections.", labels, stats.wait_ns_total / 1e9),
+        ]
+    return samples
+
+
+metrics = Metrics()
@@ -0,0 +1,215 @@
+import functools
+import inspect
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from src.telemetry.histogram import Histogram
+
+# Phases reported for every request, in header order. Apart from
+# routing, which also covers the middleware stack, they don't overlap:
+# service is the endpoint's own time with checkout and SQL taken out.
+PHASES = ("routing", "validation", "db_checkout", "sql", "service", "serialization")
+
+# Individual statements listed in Server-Timing before the rest are
+# only counted in the sql total.
+MAX_LISTED_STATEMENTS = 10
+
+_current: ContextVar["RequestTimings | None"] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Timestamps and DB costs collected while one request runs."""
+
+    __slots__ = (
+        "start_ns",
+        "handler_start_ns",
+        "endpoint_start_ns",
+        "endpoint_end_ns",
+        "handler_end_ns",
+        "checkout_ns",
+        "statements",
+    )
+
+    def __init__(self) -> None:
+        self.start_ns = time.perf_counter_ns()
+        self.handler_start_ns = 0
+        self.endpoint_start_ns = 0
+        self.endpoint_end_ns = 0
+        self.handler_end_ns = 0
+        self.checkout_ns = 0
+        self.statements: list[int] = []
+
+    def phases_ms(self, now_ns: int) -> dict[str, float]:
+        """Milliseconds per phase; phases the request never reached are 0."""
+        def span(start, end):
+            return (end - start) / 1e6 if start and end else 0.0
+
+        sql = sum(self.statements) / 1e6
+        checkout = self.checkout_ns / 1e6
+        return {
+            "routing": span(self.start_ns, self.handler_start_ns or now_ns),
+            "validation": span(self.handler_start_ns, self.endpoint_start_ns),
+            "db_checkout": checkout,
+            "sql": sql,
+            "service": max(span(self.endpoint_start_ns, self.endpoint_end_ns) - checkout - sql, 0.0),
+            "serialization": span(self.endpoint_end_ns, self.handler_end_ns or now_ns),
+            "total": (now_ns - self.start_ns) / 1e6,
+        }
+
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+def note_checkout(wait_ns: int) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.checkout_ns += wait_ns
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement run on `engine` against the current request."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_ns", []).append(time.perf_counter_ns())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_ns"].pop()
+        timings = _current.get()
+        if timings is not None:
+            timings.statements.append(time.perf_counter_ns() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        # Keep the start stack balanced when a statement fails.
+        starts = context.connection.info.get("query_start_ns") if context.connection else None
+        if starts:
+            starts.pop()
+
+
+def _timed_endpoint(endpoint):
+    """Wrap an endpoint to mark when its own code starts and ends. The
+    signature is preserved so FastAPI still sees the original parameters."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            timings.endpoint_start_ns = time.perf_counter_ns()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings.endpoint_end_ns = time.perf_counter_ns()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return endpoint(*args, **kwargs)
+            timings.endpoint_start_ns = time.perf_counter_ns()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                timings.endpoint_end_ns = time.perf_counter_ns()
+    return wrapper
+
+
+class TimedAPIRoute(APIRoute):
+    """APIRoute that marks the handler and endpoint boundaries: before the
+    endpoint is request parsing and validation, after it is response
+    serialization."""
+
+    def __init__(self, path, endpoint, **kwargs) -> None:
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            timings = _current.get()
+            if timings is None:
+                return await handler(request)
+            timings.handler_start_ns = time.perf_counter_ns()
+            try:
+                return await handler(request)
+            finally:
+                timings.handler_end_ns = time.perf_counter_ns()
+
+        return timed_handler
+
+
+class TimingHistograms:
+    """Per-route, per-phase latency histograms in milliseconds."""
+
+    def __init__(self) -> None:
+        self._routes: dict[str, dict[str, Histogram]] = defaultdict(
+            lambda: {phase: Histogram() for phase in (*PHASES, "total")}
+        )
+
+    def observe(self, route: str, phases: dict[str, float]) -> None:
+        histograms = self._routes[route]
+        for phase, value in phases.items():
+            histograms[phase].observe(value)
+
+    def items(self):
+        return self._routes.items()
+
+    def summary(self) -> dict:
+        return {
+            route: {phase: h.summary() for phase, h in phases.items() if h.count}
+            for route, phases in self._routes.items()
+        }
+
+
+def _server_timing(phases: dict[str, float], statements: list[int]) -> bytes:
+    parts = [f"{name};dur={phases[name]:.3f}" for name in PHASES]
+    for i, ns in enumerate(statements[:MAX_LISTED_STATEMENTS], 1):
+        parts.append(f"sql-{i};dur={ns / 1e6:.3f}")
+    parts.append(f"total;dur={phases['total']:.3f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header with the request's phase breakdown and
+    records it in `histograms`, keyed by route template."""
+
+    def __init__(self, app, histograms: "TimingHistograms") -> None:
+        self.app = app
+        self.histograms = histograms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                phases = timings.phases_ms(time.perf_counter_ns())
+                route = scope.get("route")
+                self.histograms.observe(getattr(route, "path", "<unmatched>"), phases)
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"server-timing", _server_timing(phases, timings.statements)),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+
+
+timing_histograms = TimingHistograms()
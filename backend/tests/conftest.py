@@ -121,7 +121,7 @@ import uuid
 from datetime import date
 
 
-from src.db.main import get_session
+from src.db.main import get_read_session, get_session
 
 DB_URL = Config.TEST_DATABASE_URL
 
@@ -148,16 +148,35 @@ def test_client():
             from src.db.models import UdyamApplication, VerificationAttempt
 
             await conn.run_sync(SQLModel.metadata.create_all)
+        # Its connections belong to this loop; the client runs its own.
+        await test_engine.dispose()
 
     asyncio.run(init_models())
 
     # Override the session dependency
     app.dependency_overrides[get_session] = test_get_session
+    app.dependency_overrides[get_read_session] = test_get_session
 
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Every test client shares one address; start each test with full buckets."""
+    from src.ratelimit import rate_limiter
+
+    rate_limiter.clear()
+
+
+@pytest.fixture()
+def admin_headers(monkeypatch):
+    """Configure an admin key and return the header that carries it."""
+    from src.auth import require_admin
+    monkeypatch.setattr(require_admin, "api_key", "test-admin-key")
+    return {"Authorization": "Bearer test-admin-key"}
+
+
 @pytest.fixture()
 def aadhaar_payload():
     return {
@@ -261,6 +261,7 @@
 
 # tests/test_aadhaar_routes.py
 import json
+import uuid
 from unittest.mock import AsyncMock
 from fastapi import status
 
@@ -347,3 +348,45 @@ def test_verify_otp_generic_error(test_client, monkeypatch, otp_verify_payload):
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.json() == {"detail": "Service down"}
+
+def test_resend_otp_requires_verifying_again(test_client):
+    aadhaar_number = f"{uuid.uuid4().int % 10**12:012d}"
+    send = {"aadhaarNumber": aadhaar_number, "entrepreneurName": "John Doe", "consent": True}
+    pan = {
+        "panNumber": "ABCDE1234F",
+        "panHolderName": "John Doe",
+        "dobOrDoi": "1990-01-01",
+        "consent": True,
+    }
+
+    first = test_client.post(f"{BASE_URL}/send-otp", json=send).json()
+    verify = {"app_id": first["appId"], "transaction_id": first["transactionId"], "otp": "123456"}
+    assert test_client.post(f"{BASE_URL}/verify-otp", json=verify).status_code == status.HTTP_200_OK
+
+    # Resending reuses the draft but drops its Aadhaar verification.
+    resent = test_client.post(f"{BASE_URL}/send-otp", json=send).json()
+    assert resent["appId"] == first["appId"]
+    response = test_client.post("/api/v1/pan/verify", json={"appId": first["appId"], **pan})
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    verify["transaction_id"] = resent["transactionId"]
+    assert test_client.post(f"{BASE_URL}/verify-otp", json=verify).status_code == status.HTTP_200_OK
+    response = test_client.post("/api/v1/pan/verify", json={"appId": first["appId"], **pan})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_send_otp_retry_with_idempotency_key_is_replayed(test_client):
+    from src.idempotency import idempotency_store
+
+    aadhaar_number = f"{uuid.uuid4().int % 10**12:012d}"
+    send = {"aadhaarNumber": aadhaar_number, "entrepreneurName": "John Doe", "consent": True}
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+
+    first = test_client.post(f"{BASE_URL}/send-otp", json=send, headers=headers)
+    # As if the retry had reached another worker: only the table has it.
+    idempotency_store._entries.clear()
+    retry = test_client.post(f"{BASE_URL}/send-otp", json=send, headers=headers)
+
+    assert retry.status_code == first.status_code == status.HTTP_200_OK
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
@@ -0,0 +1,75 @@
+# tests/test_access_log.py
+import logging
+import queue
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from src.access_log import AccessLogMiddleware, DroppingQueueHandler, logger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(record.getMessage())
+
+
+@pytest.fixture()
+def captured():
+    handler = ListHandler()
+    logger.addHandler(handler)
+    yield handler.lines
+    logger.removeHandler(handler)
+
+
+def make_client(sample_rate):
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(AccessLogMiddleware, sample_rate=sample_rate)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_logs_method_path_status_and_duration(captured):
+    make_client(sample_rate=1.0).get("/ok")
+
+    assert len(captured) == 1
+    assert " - GET /ok -> 200 in " in captured[0]
+
+
+def test_sampling_skips_successes_but_keeps_server_errors(captured):
+    client = make_client(sample_rate=0.0)
+    client.get("/ok")
+    client.get("/boom")
+
+    assert len(captured) == 1
+    assert "GET /boom -> 500" in captured[0]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "msg", None, None)
+
+    handler.emit(record)
+    handler.emit(record)
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_app_logs_requests_rejected_by_outer_middleware(test_client, captured):
+    response = test_client.get("/", headers={"host": "attacker.example"})
+
+    assert response.status_code == 400
+    assert any("GET / -> 400" in line for line in captured)
@@ -0,0 +1,126 @@
+# tests/test_admission.py
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.admission import (
+    CRITICAL,
+    NORMAL,
+    SHEDDABLE,
+    AdmissionController,
+    AdmissionMiddleware,
+    route_priority,
+)
+from src.config import Config
+from src.db.main import build_engine
+from src.db.pool import PrimaryQueuePool
+
+MS = 1_000_000
+
+
+def make_controller(**kwargs):
+    options = dict(target_ms=50, interval_ms=100, max_in_flight=10, min_in_flight=2)
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def test_route_priorities():
+    assert route_priority("/api/v1/udyam/0190/submit") == CRITICAL
+    assert route_priority("/api/v1/pan/verify") == NORMAL
+    assert route_priority("/api/v1/aadhaar/verify-otp") == NORMAL
+    assert route_priority("/api/v1/aadhaar/send-otp") == SHEDDABLE
+    assert route_priority("/api/v1/udyam/applications") == NORMAL
+
+
+def test_sheddable_requests_are_refused_before_critical_ones():
+    controller = make_controller()
+    now = controller._window_end_ns - 1
+    admitted = [controller.admit(SHEDDABLE, now) for _ in range(6)]
+    assert admitted == [True] * 5 + [False]
+
+    assert controller.admit(NORMAL, now) and controller.admit(NORMAL, now) and controller.admit(NORMAL, now)
+    assert not controller.admit(NORMAL, now)
+    assert controller.admit(CRITICAL, now) and controller.admit(CRITICAL, now)
+    assert not controller.admit(CRITICAL, now)
+    assert controller.stats()["rejected"] == {"critical": 1, "normal": 1, "sheddable": 1}
+
+    controller.release()
+    assert controller.admit(CRITICAL, now)
+
+
+def test_standing_queue_shrinks_the_limit_and_recovery_grows_it():
+    controller = make_controller()
+    now = controller._window_end_ns
+
+    # A burst with one fast checkout in the window is not a standing queue.
+    controller.observe_wait(200 * MS, now)
+    controller.observe_wait(1 * MS, now)
+    controller.observe_wait(0, now + 100 * MS)
+    assert controller.limit == 10
+
+    # Every checkout waited 80ms against a 50ms target: shrink by 50/80.
+    controller.observe_wait(80 * MS, now + 200 * MS)
+    controller.admit(CRITICAL, now + 300 * MS)
+    assert controller.stats()["queue_delay_ms"] == 80
+    assert controller.limit == pytest.approx(10 * 50 / 80)
+
+    # A far worse delay at most halves it, down to the floor.
+    for i in range(4, 8):
+        controller.observe_wait(1000 * MS, now + 100 * i * MS)
+    controller.admit(CRITICAL, now + 800 * MS)
+    assert controller.limit == 2
+
+    # Three quiet intervals later it has grown back by three.
+    controller.admit(CRITICAL, now + 1100 * MS)
+    assert controller.limit == 5
+
+
+def test_middleware_answers_503_without_running_the_route():
+    controller = make_controller(max_in_flight=2)
+    app = FastAPI()
+    calls = []
+
+    @app.post("/api/v1/aadhaar/send-otp")
+    async def send_otp():
+        calls.append("send-otp")
+        return {"ok": True}
+
+    @app.get("/")
+    async def health():
+        return {"status": "ok"}
+
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    client = TestClient(app)
+
+    assert client.post("/api/v1/aadhaar/send-otp").status_code == 200
+    assert controller.in_flight == 0
+
+    controller.in_flight = 1  # another request is still running
+    response = client.post("/api/v1/aadhaar/send-otp")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert calls == ["send-otp"]
+    assert client.get("/").status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_only_primary_checkouts_of_pooled_connections_are_observed(test_client):
+    class ObservedPool(PrimaryQueuePool):
+        admission = Mock()
+
+    primary = build_engine(Config.TEST_DATABASE_URL, poolclass=ObservedPool)
+    replica = build_engine(Config.TEST_DATABASE_URL)
+    try:
+        for engine in (primary, replica):
+            # The first checkout opens the connection, the second reuses it.
+            for _ in range(2):
+                async with engine.connect():
+                    pass
+        ObservedPool.admission.observe_wait.assert_called_once()
+        assert replica.pool.admission is None
+        assert primary.pool.stats.checkouts == replica.pool.stats.checkouts == 2
+    finally:
+        await primary.dispose()
+        await replica.dispose()
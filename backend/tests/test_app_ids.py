@@ -0,0 +1,39 @@
+# tests/test_app_ids.py
+import uuid
+
+import pytest
+
+from src.cache.app_ids import AppIdFilter
+from src.cache.app_state import AppStateCache
+from src.db.ids import uuid7
+
+
+def test_uuid7_is_time_ordered_and_versioned():
+    first, second = uuid7(), uuid7()
+
+    assert first.version == 7 and first.variant == uuid.RFC_4122
+    assert first.int >> 80 <= second.int >> 80
+
+
+def test_negative_cache_until_added():
+    id_filter = AppIdFilter(negative_ttl=60)
+    app_id = uuid7()
+
+    assert id_filter.might_exist(app_id)
+    id_filter.record_miss(app_id)
+    assert not id_filter.might_exist(app_id)
+    id_filter.add(app_id)
+    assert id_filter.might_exist(app_id)
+
+
+def test_state_cache_guard_only_rejects_recorded_misses():
+    id_filter = AppIdFilter(negative_ttl=60)
+    cache = AppStateCache(max_entries=10, ttl=60, id_filter=id_filter)
+
+    # Never seen here, but another process may have inserted it: ask the database.
+    cache.guard(uuid.uuid4(), "verify_pan")
+
+    missing = uuid.uuid4()
+    id_filter.record_miss(missing)
+    with pytest.raises(ValueError, match="Application not found"):
+        cache.guard(missing, "verify_pan")
@@ -0,0 +1,75 @@
+# tests/test_app_state_cache.py
+import uuid
+
+import pytest
+
+from src.cache.app_state import (
+    AppState,
+    AppStateCache,
+    InvalidTransitionError,
+    check_transition,
+    parse_app_id,
+)
+
+DRAFT = AppState(aadhaar_verified=False, pan_verified=False, status="draft", version=1)
+
+
+def test_lru_evicts_least_recently_used_and_counts_hits():
+    cache = AppStateCache(max_entries=2, ttl=60)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.put(a, DRAFT)
+    cache.put(b, DRAFT)
+    cache.get(a)
+    cache.put(c, DRAFT)
+
+    assert cache.get(b) is None
+    assert cache.get(a) == DRAFT
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entries_are_misses():
+    cache = AppStateCache(max_entries=10, ttl=-1)
+    app_id = uuid.uuid4()
+    cache.put(app_id, DRAFT)
+
+    assert cache.get(app_id) is None
+
+
+def test_older_version_never_replaces_newer():
+    cache = AppStateCache(max_entries=10, ttl=60)
+    app_id = uuid.uuid4()
+    newer = AppState(aadhaar_verified=True, pan_verified=False, status="draft", version=3)
+    cache.put(app_id, newer)
+    cache.put(app_id, DRAFT)
+
+    assert cache.get(app_id) == newer
+
+
+def test_check_transition_enforces_step_order():
+    check_transition(DRAFT, "verify_otp")
+    with pytest.raises(InvalidTransitionError, match="Aadhaar must be verified"):
+        check_transition(DRAFT, "verify_pan")
+    with pytest.raises(InvalidTransitionError, match="PAN must be verified"):
+        check_transition(AppState(True, False, "draft", 2), "submit")
+    with pytest.raises(InvalidTransitionError, match="already submitted"):
+        check_transition(AppState(True, True, "submitted", 4), "verify_otp")
+
+
+def test_guard_rejects_only_terminal_cached_states():
+    cache = AppStateCache(max_entries=10, ttl=60)
+    draft_id, submitted_id = uuid.uuid4(), uuid.uuid4()
+    cache.put(draft_id, DRAFT)
+    cache.put(submitted_id, AppState(True, True, "submitted", 4))
+
+    # A cached unverified flag may be stale, so the database decides.
+    cache.guard(draft_id, "verify_pan")
+    with pytest.raises(InvalidTransitionError):
+        cache.guard(submitted_id, "submit")
+
+
+def test_parse_app_id_rejects_malformed_ids():
+    app_id = uuid.uuid4()
+    assert parse_app_id(str(app_id)) == app_id
+    with pytest.raises(ValueError, match="Application not found"):
+        parse_app_id("not-a-uuid")
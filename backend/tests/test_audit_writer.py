@@ -0,0 +1,171 @@
+# tests/test_audit_writer.py
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from sqlalchemy.exc import IntegrityError
+
+from src.db.audit import AuditWriter
+from src.db.models import VerificationAttempt
+
+
+class RecordingWriter(AuditWriter):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    async def _write(self, rows, retry_forever):
+        self.batches.append(rows)
+
+
+def make_attempt():
+    return VerificationAttempt(app_id=uuid.uuid4(), kind="pan", success=True, payload={})
+
+
+@pytest.mark.asyncio
+async def test_flushes_full_batches():
+    writer = RecordingWriter(batch_size=3, flush_interval=5)
+    await writer.start()
+
+    for _ in range(6):
+        await writer.record(make_attempt())
+    await asyncio.sleep(0.05)
+
+    assert [len(batch) for batch in writer.batches] == [3, 3]
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_batch_after_interval():
+    writer = RecordingWriter(batch_size=100, flush_interval=0.05)
+    await writer.start()
+
+    await writer.record(make_attempt())
+    await asyncio.sleep(0.2)
+
+    assert [len(batch) for batch in writer.batches] == [1]
+    assert writer.batches[0][0]["id"] is not None
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue():
+    writer = RecordingWriter(batch_size=2, flush_interval=5)
+    await writer.start()
+
+    for _ in range(5):
+        await writer.record(make_attempt())
+    await writer.stop()
+
+    assert sum(len(batch) for batch in writer.batches) == 5
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_full_queue_writes_directly():
+    writer = RecordingWriter(batch_size=10, flush_interval=5, max_queue=1, enqueue_timeout=0.01)
+    writer._queue = asyncio.Queue(maxsize=1)
+    writer._queue.put_nowait({"id": uuid.uuid4()})
+
+    await writer.record(make_attempt())
+
+    assert len(writer.batches) == 1
+    assert writer._queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_commit_and_record_inline_when_not_running():
+    writer = RecordingWriter()
+    session = MagicMock()
+    session.commit = AsyncMock()
+    attempt = make_attempt()
+
+    await writer.commit_and_record(session, attempt)
+
+    session.add.assert_called_once_with(attempt)
+    session.commit.assert_awaited_once()
+    assert writer.batches == []
+
+
+class FlakyWriter(AuditWriter):
+    """Fails the first `failures` inserts, and any insert holding a bad row."""
+
+    def __init__(self, failures=0, bad_ids=(), **kwargs):
+        super().__init__(retry_delay=0, **kwargs)
+        self.failures = failures
+        self.bad_ids = set(bad_ids)
+        self.written = []
+
+    async def _insert(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        if any(row["id"] in self.bad_ids for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("violates foreign key constraint"))
+        self.written.extend(rows)
+
+
+@pytest.mark.asyncio
+async def test_write_retries_until_the_database_is_back():
+    writer = FlakyWriter(failures=5, retries=3)
+    rows = [{"id": uuid.uuid4()} for _ in range(3)]
+
+    await writer._write(rows, retry_forever=True)
+
+    assert writer.written == rows
+    assert writer.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_bad_row_is_dropped_and_counted_alone():
+    bad = uuid.uuid4()
+    writer = FlakyWriter(bad_ids=[bad])
+    rows = [{"id": uuid.uuid4()}, {"id": bad}, {"id": uuid.uuid4()}]
+
+    await writer._write(rows, retry_forever=True)
+
+    assert writer.written == [rows[0], rows[2]]
+    assert writer.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_counts_rows_left_when_it_gives_up():
+    writer = FlakyWriter(failures=10**6, batch_size=2, flush_interval=5)
+    await writer.start()
+    for _ in range(5):
+        await writer.record(make_attempt())
+
+    await writer.stop(timeout=0.1)
+
+    assert writer.written == []
+    assert writer.dropped == 5
+
+
+@pytest.mark.asyncio
+async def test_direct_write_gives_up_during_an_outage():
+    writer = FlakyWriter(failures=10**6, retries=3, max_queue=1, enqueue_timeout=0.01)
+    writer._queue = asyncio.Queue(maxsize=1)
+    writer._queue.put_nowait({"id": uuid.uuid4()})
+
+    await asyncio.wait_for(writer.record(make_attempt()), 1)
+
+    assert writer.failures == 10**6 - 3
+    assert writer.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_is_bounded_when_the_queue_is_full():
+    writer = FlakyWriter(failures=10**6, batch_size=1, max_queue=2, enqueue_timeout=0.01)
+    await writer.start()
+    for _ in range(4):
+        await writer.record(make_attempt())
+
+    # One row is being retried by the task, the queue holds two more and
+    # the last producer gave up on its own.
+    assert writer._queue.full()
+    assert writer.dropped == 1
+    await asyncio.wait_for(writer.stop(timeout=0.1), 1)
+
+    assert not writer.running
+    assert writer.dropped == 4
@@ -0,0 +1,100 @@
+# tests/test_compression.py
+import gzip
+
+import brotli
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.compression import CompressionMiddleware
+
+ROWS = [{"id": i, "name": f"Entrepreneur {i}", "status": "submitted"} for i in range(200)]
+
+
+def make_client():
+    app = FastAPI()
+
+    @app.get("/list")
+    async def listing():
+        return {"items": ROWS}
+
+    @app.get("/verified")
+    async def verified():
+        return {"verified": True}
+
+    @app.get("/stream")
+    async def stream(chunks: int = 50, size: int = 400):
+        async def body():
+            for i in range(chunks):
+                yield (f"{i:04d}" * (size // 4) + "\n").encode()
+
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    @app.get("/encoded")
+    async def encoded():
+        body = gzip.compress(b"x" * 5000)
+        return Response(body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/binary")
+    async def binary():
+        return Response(b"\x00" * 5000, media_type="application/vnd.apache.parquet")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, gzip_level=6, brotli_quality=4)
+    return TestClient(app)
+
+
+def raw_get(client, path, encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_json_is_compressed_with_the_preferred_encoding():
+    client = make_client()
+
+    response, body = raw_get(client, "/list", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert b'"Entrepreneur 199"' in brotli.decompress(body)
+
+    response, body = raw_get(client, "/list", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert b'"Entrepreneur 199"' in gzip.decompress(body)
+
+
+def test_small_and_ineligible_responses_pass_through():
+    client = make_client()
+
+    response, body = raw_get(client, "/verified", "gzip, br")
+    assert "content-encoding" not in response.headers
+    assert body == b'{"verified":true}'
+
+    response, body = raw_get(client, "/encoded", "br")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == b"x" * 5000
+
+    response, body = raw_get(client, "/binary", "gzip")
+    assert "content-encoding" not in response.headers
+    assert len(body) == 5000
+
+    response, body = raw_get(client, "/list", "identity")
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_compressed_chunk_by_chunk():
+    client = make_client()
+    expected = b"".join((f"{i:04d}" * 100 + "\n").encode() for i in range(50))
+
+    response, body = raw_get(client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(body) == expected
+
+    response, body = raw_get(client, "/stream", "br")
+    assert brotli.decompress(body) == expected
+
+
+def test_short_stream_below_threshold_is_sent_uncompressed():
+    response, body = raw_get(make_client(), "/stream?chunks=3&size=100", "gzip")
+    assert "content-encoding" not in response.headers
+    assert body.count(b"\n") == 3
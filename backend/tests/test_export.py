@@ -0,0 +1,67 @@
+# tests/test_export.py
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from src.services.export_service import (
+    EXPORT_FIELDS,
+    encode_csv,
+    encode_ndjson,
+    gzip_stream,
+)
+
+
+def make_row(n):
+    row = dict.fromkeys(EXPORT_FIELDS)
+    row.update(
+        id=uuid.UUID(int=n),
+        entrepreneur_name=f"Name {n}",
+        status="submitted",
+        created_at=datetime(2025, 1, 1, 12, n),
+        form_payload={"n": n},
+    )
+    return row
+
+
+async def chunks(*sizes):
+    n = 0
+    for size in sizes:
+        yield [make_row(n + i) for i in range(size)]
+        n += size
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_emits_one_line_per_row_per_chunk():
+    out = await collect(encode_ndjson(chunks(2, 1)))
+
+    assert len(out) == 2
+    lines = b"".join(out).decode().splitlines()
+    assert [json.loads(line)["entrepreneur_name"] for line in lines] == ["Name 0", "Name 1", "Name 2"]
+    assert json.loads(lines[0])["created_at"] == "2025-01-01T12:00:00"
+
+
+@pytest.mark.asyncio
+async def test_csv_writes_header_once_and_json_encodes_payload():
+    out = await collect(encode_csv(chunks(2, 2)))
+
+    rows = list(csv.DictReader(io.StringIO(b"".join(out).decode())))
+    assert len(rows) == 4
+    assert rows[3]["id"] == str(uuid.UUID(int=3))
+    assert json.loads(rows[3]["form_payload"]) == {"n": 3}
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_round_trips():
+    raw = b"".join(await collect(encode_ndjson(chunks(50))))
+    compressed = b"".join(await collect(gzip_stream(encode_ndjson(chunks(50)))))
+
+    assert gzip.decompress(compressed) == raw
@@ -4,3 +4,26 @@ def test_health_check(test_client):
     response = test_client.get("/")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_pool_status(test_client):
+    response = test_client.get("/pool")
+    assert response.status_code == 200
+    body = response.json()
+    for key in ("size", "checked_out", "overflow", "checkouts", "wait_ms_avg", "wait_ms_max"):
+        assert key in body
+
+
+def test_cache_stats(test_client):
+    response = test_client.get("/cache")
+    assert response.status_code == 200
+    assert {"size", "hits", "misses", "hit_ratio"} <= response.json()["app_state"].keys()
+
+
+def test_metrics_exposition(test_client):
+    test_client.get("/")
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{route="/",method="GET",status="200"' in response.text
+    assert 'db_pool_size{pool="primary"' in response.text
@@ -0,0 +1,203 @@
+# tests/test_idempotency.py
+import asyncio
+import uuid
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from fastapi import status
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.config import Config
+from src.idempotency import (
+    Claim,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    IdempotentReplay,
+    idempotency_claim,
+    replay_response,
+)
+from src.ratelimit import RateLimit, client_ip
+
+
+def idempotent_app(routes=("/items", "/denied")) -> FastAPI:
+    app = FastAPI(dependencies=[Depends(idempotency_claim)])
+    app.add_middleware(IdempotencyMiddleware, store=IdempotencyStore(persist=False), routes=routes)
+    app.add_exception_handler(IdempotentReplay, replay_response)
+    return app
+
+
+@pytest.fixture()
+def idempotent_client():
+    app = idempotent_app()
+    app.state.calls = 0
+
+    @app.post("/items")
+    async def create_item(payload: dict):
+        app.state.calls += 1
+        return {"call": app.state.calls, **payload}
+
+    @app.post("/denied")
+    async def denied(payload: dict):
+        app.state.calls += 1
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+    @app.post("/uploads")
+    async def upload(payload: dict):
+        app.state.calls += 1
+        return {"call": app.state.calls}
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_repeated_key_replays_response(idempotent_client):
+    headers = {"Idempotency-Key": "abc-123"}
+
+    first = idempotent_client.post("/items", json={"name": "x"}, headers=headers)
+    second = idempotent_client.post("/items", json={"name": "x"}, headers=headers)
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.json() == second.json() == {"call": 1, "name": "x"}
+    assert second.headers["idempotent-replayed"] == "true"
+    assert idempotent_client.app.state.calls == 1
+
+
+def test_requests_without_key_are_not_stored(idempotent_client):
+    idempotent_client.post("/items", json={"name": "x"})
+    response = idempotent_client.post("/items", json={"name": "x"})
+
+    assert response.json()["call"] == 2
+    assert "idempotent-replayed" not in response.headers
+
+
+def test_key_reused_with_different_body(idempotent_client):
+    headers = {"Idempotency-Key": "abc-456"}
+
+    idempotent_client.post("/items", json={"name": "x"}, headers=headers)
+    response = idempotent_client.post("/items", json={"name": "y"}, headers=headers)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert idempotent_client.app.state.calls == 1
+
+
+def test_key_is_scoped_to_the_endpoint():
+    app = idempotent_app(routes=("/items", "/orders"))
+
+    @app.post("/items")
+    async def create_item(payload: dict):
+        return {"route": "items"}
+
+    @app.post("/orders")
+    async def create_order(payload: dict):
+        return {"route": "orders"}
+
+    headers = {"Idempotency-Key": "shared-key"}
+    with TestClient(app) as client:
+        client.post("/items", json={"name": "x"}, headers=headers)
+        response = client.post("/orders", json={"name": "x"}, headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"route": "orders"}
+    assert "idempotent-replayed" not in response.headers
+
+
+def test_unauthorized_responses_are_not_replayed(idempotent_client):
+    headers = {"Idempotency-Key": "abc-789"}
+
+    idempotent_client.post("/denied", json={}, headers=headers)
+    response = idempotent_client.post("/denied", json={}, headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert "idempotent-replayed" not in response.headers
+    assert idempotent_client.app.state.calls == 2
+
+
+def test_other_routes_are_passed_through(idempotent_client):
+    headers = {"Idempotency-Key": "abc-000"}
+
+    idempotent_client.post("/uploads", json={}, headers=headers)
+    response = idempotent_client.post("/uploads", json={}, headers=headers)
+
+    assert response.json() == {"call": 2}
+    assert "idempotent-replayed" not in response.headers
+
+
+@pytest.fixture()
+def db_engine(test_client):
+    # Unpooled, so no connection outlives the test's event loop.
+    return create_async_engine(Config.TEST_DATABASE_URL, poolclass=NullPool)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_on_another_worker_waits_for_the_first(db_engine):
+    # Two stores sharing the table stand in for two worker processes.
+    first = IdempotencyStore(engine=db_engine, poll_interval=0.01)
+    second = IdempotencyStore(engine=db_engine, poll_interval=0.01)
+    key = uuid.uuid4().hex
+
+    owner = Claim(first, key, "hash")
+    await first.acquire(owner)
+    assert owner.owned
+
+    with pytest.raises(HTTPException) as rejected:
+        await second.acquire(Claim(second, key, "other-hash"))
+    assert rejected.value.status_code == 422
+
+    duplicate = asyncio.create_task(second.acquire(Claim(second, key, "hash")))
+    await asyncio.sleep(0.05)
+    assert not duplicate.done()
+
+    await first.complete(owner, 201, b'{"ok": true}', "application/json")
+    await first.release(owner, True)
+    with pytest.raises(IdempotentReplay) as replayed:
+        await duplicate
+    assert replayed.value.stored.status_code == 201
+    assert replayed.value.stored.body == b'{"ok": true}'
+
+
+@pytest.mark.asyncio
+async def test_duplicate_gives_up_while_the_first_is_running(db_engine):
+    first = IdempotencyStore(engine=db_engine)
+    second = IdempotencyStore(engine=db_engine, wait_timeout=0.05, poll_interval=0.01)
+    key = uuid.uuid4().hex
+
+    owner = Claim(first, key, "hash")
+    await first.acquire(owner)
+    with pytest.raises(HTTPException) as conflict:
+        await second.acquire(Claim(second, key, "hash"))
+    assert conflict.value.status_code == 409
+
+    # A failed request frees the key for the next attempt.
+    await first.release(owner, False)
+    retry = Claim(second, key, "hash")
+    await second.acquire(retry)
+    assert retry.owned
+    await second.release(retry, False)
+
+
+def test_rate_limited_requests_never_claim_the_key():
+    app = FastAPI()
+    store = IdempotencyStore(persist=False)
+    app.add_middleware(IdempotencyMiddleware, store=store, routes=("/items",))
+    app.add_exception_handler(IdempotentReplay, replay_response)
+    limit = RateLimit("items", "1/minute", client_ip, max_keys=10)
+    acquired = []
+    original = store.acquire
+
+    async def acquire(claim):
+        acquired.append(claim.key)
+        await original(claim)
+
+    store.acquire = acquire
+
+    @app.post("/items", dependencies=[Depends(limit), Depends(idempotency_claim)])
+    async def create_item(payload: dict):
+        return {}
+
+    with TestClient(app) as client:
+        assert client.post("/items", json={}, headers={"Idempotency-Key": "a"}).status_code == 200
+        assert client.post("/items", json={}, headers={"Idempotency-Key": "b"}).status_code == 429
+
+    assert len(acquired) == 1
@@ -0,0 +1,84 @@
+# tests/test_import.py
+import hashlib
+import json
+from datetime import datetime
+
+import pytest
+
+from src.schemas.import_schemas import ApplicationImportRecord
+from src.services.import_service import COPY_COLUMNS, ImportService, build_rows, iter_lines
+
+RECORD = {
+    "aadhaar": {"aadhaarNumber": "123412341234", "entrepreneurName": "Asha", "consent": True},
+    "pan": {"panNumber": "ABCDE1234F", "panHolderName": "Asha", "dobOrDoi": "1990-01-01", "consent": True},
+    "form": {
+        "entrepreneurName": "Asha Traders",
+        "typeOfOrganisation": "1",
+        "dobOrDoi": "01-01-1990",
+        "previousYearITR": "1",
+        "hasGSTIN": "2",
+    },
+    "createdAt": "2020-05-01T10:00:00+05:30",
+}
+
+
+def test_build_rows_hashes_masks_and_maps_form():
+    draft = ApplicationImportRecord.model_validate({"aadhaar": RECORD["aadhaar"]})
+    submitted = ApplicationImportRecord.model_validate(RECORD)
+
+    rows = [dict(zip(COPY_COLUMNS, row)) for row in build_rows([draft, submitted])]
+
+    assert rows[0]["status"] == "draft"
+    assert rows[0]["pan_hash"] is None and rows[0]["pan_verified"] is False
+    assert rows[0]["aadhaar_verified"] is False and rows[0]["aadhaar_verified_at"] is None
+    assert rows[1]["aadhaar_hash"] == hashlib.sha256(b"123412341234").hexdigest()
+    assert rows[1]["aadhaar_last4"] == "1234"
+    assert rows[1]["pan_hash"] == hashlib.sha256(b"ABCDE1234F").hexdigest()
+    assert rows[1]["pan_masked"] == "ABCDE*****F"
+    assert rows[1]["status"] == "submitted"
+    assert rows[1]["entrepreneur_name"] == "Asha Traders"
+    assert rows[1]["has_gstin_status"] == "2"
+    assert rows[1]["created_at"] == datetime(2020, 5, 1, 4, 30)
+    assert json.loads(rows[1]["form_payload"])["typeOfOrganisation"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_joins_lines_split_across_chunks():
+    async def chunks():
+        yield b'{"a": 1}\n{"b"'
+        yield b': 2}\n'
+        yield b'{"c": 3}'
+
+    assert [line async for line in iter_lines(chunks())] == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+class RecordingImport(ImportService):
+    """Captures loaded chunks instead of writing to the database."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.chunks = []
+
+    async def _load(self, batch, report):
+        self.chunks.append([line_no for line_no, _ in batch])
+        report["inserted"] += len(batch)
+
+
+@pytest.mark.asyncio
+async def test_ingest_reports_invalid_lines_and_chunks_the_rest():
+    bad = {**RECORD, "aadhaar": {**RECORD["aadhaar"], "aadhaarNumber": "12x"}}
+    lines = [json.dumps(RECORD), "", json.dumps(bad), "not json", json.dumps(RECORD), json.dumps(RECORD)]
+
+    async def source():
+        for line in lines:
+            yield line
+
+    service = RecordingImport(chunk_size=2)
+    report = await service.ingest(source())
+
+    assert service.chunks == [[1, 5], [6]]
+    assert report["received"] == 5
+    assert report["inserted"] == 3
+    assert report["failed"] == 2
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+    assert report["errors"][0]["error"].startswith("aadhaar.aadhaarNumber:")
@@ -0,0 +1,46 @@
+# tests/test_lifecycle.py
+import pytest
+from sqlalchemy import func, select
+
+from src.config import Config
+from src.db.main import build_engine
+from src.db.models import UdyamApplication
+from src.lifecycle import DRAINING, READY, Lifecycle, prewarm
+
+
+def test_ready_after_startup(test_client):
+    response = test_client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+@pytest.mark.asyncio
+async def test_prewarm_leaves_connections_pooled_and_no_rows(test_client):
+    engine = build_engine(Config.TEST_DATABASE_URL)
+    try:
+        assert await prewarm(engine, 3) == 3
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+
+        async with engine.connect() as conn:
+            count = select(func.count()).where(UdyamApplication.entrepreneur_name == "warmup")
+            assert (await conn.execute(count)).scalar() == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_prewarm_is_capped_at_pool_size(test_client):
+    engine = build_engine(Config.TEST_DATABASE_URL)
+    try:
+        assert await prewarm(engine, 1000, writes=False) == engine.pool.size()
+    finally:
+        await engine.dispose()
+
+
+def test_drain_stops_reporting_ready():
+    lifecycle = Lifecycle()
+    lifecycle.state = READY
+    lifecycle.drain()
+    assert lifecycle.state == DRAINING
+    assert not lifecycle.ready
@@ -0,0 +1,70 @@
+# tests/test_metrics.py
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.telemetry.metrics import WORKER_ENV, Metrics, MetricsMiddleware
+
+
+def make_client():
+    app = FastAPI()
+    app.state.metrics = Metrics()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    app.add_middleware(MetricsMiddleware, metrics=app.state.metrics)
+    return TestClient(app)
+
+
+def test_requests_are_counted_by_route_template_and_status():
+    client = make_client()
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/items/x")
+    client.get("/missing")
+
+    requests = client.app.state.metrics.requests
+    assert requests["/items/{item_id}", "GET", 200] == 2
+    assert requests["/items/{item_id}", "GET", 422] == 1
+    assert requests["<unmatched>", "GET", 404] == 1
+    assert client.app.state.metrics.in_flight == 0
+
+
+def test_render_emits_histogram_and_attempt_series():
+    metrics = Metrics()
+    metrics.observe_request("/a", "GET", 200, 7.0)
+    metrics.observe_request("/a", "GET", 200, 700.0)
+    metrics.observe_attempt("pan", True)
+
+    text = metrics.render()
+
+    assert 'http_request_duration_seconds_bucket{route="/a",method="GET",worker=' in text
+    assert 'le="0.01"} 1' in text
+    assert 'le="+Inf"} 2' in text
+    assert "http_request_duration_seconds_sum" in text
+    assert 'verification_attempts_total{kind="pan",success="true"' in text
+
+
+def test_render_groups_extra_samples_by_family():
+    samples = [
+        ("db_pool_size", "gauge", "Pool size.", {"pool": "primary"}, 10),
+        ("db_pool_overflow", "gauge", "Overflow.", {"pool": "primary"}, 0),
+        ("db_pool_size", "gauge", "Pool size.", {"pool": "replica"}, 5),
+    ]
+
+    lines = Metrics().render(samples).splitlines()
+
+    start = lines.index("# TYPE db_pool_size gauge")
+    assert lines[start + 1].startswith('db_pool_size{pool="primary"')
+    assert lines[start + 2].startswith('db_pool_size{pool="replica"')
+    assert lines.count("# TYPE db_pool_size gauge") == 1
+
+
+def test_worker_label_is_the_worker_slot(monkeypatch):
+    metrics = Metrics()
+    metrics.observe_attempt("pan", True)
+    assert 'worker="0"' in metrics.render()
+
+    monkeypatch.setenv(WORKER_ENV, "3")
+    assert 'verification_attempts_total{kind="pan",success="true",worker="3"} 1' in metrics.render()
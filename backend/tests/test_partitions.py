@@ -0,0 +1,74 @@
+# tests/test_partitions.py
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import insert, text
+
+from src.config import Config
+from src.db.main import build_engine
+from src.db.models import VerificationAttempt
+from src.db.partitions import (
+    add_months,
+    default_partition,
+    ensure_partitions,
+    expired_partitions,
+    partition_month,
+    partition_name,
+)
+from src.services.aadhaar_service import draft_upsert
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_name_round_trip():
+    name = partition_name(date(2025, 8, 1))
+    assert name == "verification_attempts_p2025_08"
+    assert partition_month(name) == date(2025, 8, 1)
+    assert partition_month("verification_attempts_default") is None
+
+
+def test_expired_partitions_respects_retention():
+    names = [
+        "verification_attempts_p2024_09",
+        "verification_attempts_p2024_10",
+        "verification_attempts_p2024_11",
+        "verification_attempts_default",
+    ]
+    # Keeping 12 months on 2025-10-18 keeps everything from 2024-10 onwards.
+    assert expired_partitions(names, 12, date(2025, 10, 18)) == ["verification_attempts_p2024_09"]
+
+
+@pytest.mark.asyncio
+async def test_ensure_moves_rows_out_of_the_default_partition(test_client):
+    engine = build_engine(Config.TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                app_id = (await conn.execute(draft_upsert("999988887777", "partition", True))).scalar()
+                await conn.execute(
+                    insert(VerificationAttempt),
+                    [
+                        {"app_id": app_id, "kind": "pan", "payload": {}, "created_at": datetime(2001, 1, 10)},
+                        {"app_id": app_id, "kind": "pan", "payload": {}, "created_at": datetime(2001, 3, 5)},
+                    ],
+                )
+
+                created = await ensure_partitions(conn, months_ahead=1, today=date(2001, 1, 20))
+
+                assert created == ["verification_attempts_p2001_01", "verification_attempts_p2001_02"]
+                assert await default_partition(conn) == "verification_attempts_default"
+                count = "SELECT count(*) FROM {} WHERE app_id = :app_id"
+                for table, rows in [
+                    ("verification_attempts_p2001_01", 1),
+                    ("verification_attempts_p2001_02", 0),
+                    ("verification_attempts_default", 1),
+                ]:
+                    assert (await conn.execute(text(count.format(table)), {"app_id": app_id})).scalar() == rows
+            finally:
+                await trans.rollback()
+    finally:
+        await engine.dispose()
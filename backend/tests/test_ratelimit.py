@@ -0,0 +1,59 @@
+# tests/test_ratelimit.py
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.ratelimit import TokenBuckets, parse_rate
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute") == (10, 60)
+    assert parse_rate("100/hours") == (100, 3600)
+    with pytest.raises(ValueError):
+        parse_rate("ten per minute")
+
+
+def test_bucket_allows_burst_then_refills():
+    buckets = TokenBuckets(count=3, period=60, max_keys=10)
+
+    assert [buckets.hit("a", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert buckets.hit("a", now=0.0) == pytest.approx(20.0)
+    assert buckets.hit("b", now=0.0) == 0.0
+
+    # One token back every 20 seconds.
+    assert buckets.hit("a", now=20.0) == 0.0
+    assert buckets.hit("a", now=20.0) > 0
+    assert buckets.limited == 2
+
+
+def test_least_recent_key_gives_up_its_slot():
+    buckets = TokenBuckets(count=1, period=60, max_keys=2)
+    buckets.hit("a", now=0.0)
+    buckets.hit("b", now=0.0)
+    buckets.hit("c", now=0.0)
+
+    assert len(buckets) == 2
+    assert buckets.hit("b", now=1.0) > 0
+    # "a" was evicted, so it starts over with a full bucket.
+    assert buckets.hit("a", now=1.0) == 0.0
+
+
+def test_send_otp_is_limited_per_aadhaar_before_the_service(test_client, monkeypatch, aadhaar_payload):
+    mock_service = AsyncMock()
+    mock_service.send_otp.return_value = {"transactionId": "t", "otpSentTo": "x", "appId": "a"}
+    monkeypatch.setattr("src.routes.aadhaar_routes.aadhaar_service", mock_service)
+
+    statuses = [
+        test_client.post("/api/v1/aadhaar/send-otp", content=json.dumps(aadhaar_payload)).status_code
+        for _ in range(6)
+    ]
+    assert statuses == [200] * 5 + [429]
+    assert mock_service.send_otp.await_count == 5
+
+    response = test_client.post("/api/v1/aadhaar/send-otp", content=json.dumps(aadhaar_payload))
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["retry-after"]) <= 12
+
+    other = {**aadhaar_payload, "aadhaarNumber": "999988887777"}
+    assert test_client.post("/api/v1/aadhaar/send-otp", content=json.dumps(other)).status_code == 200
@@ -0,0 +1,58 @@
+# tests/test_replica.py
+import asyncio
+from unittest.mock import AsyncMock
+import pytest
+
+from src.db.main import ReplicaRouter
+
+
+async def probed(router: ReplicaRouter) -> bool:
+    """Start a probe, let it finish, and return the answer after it."""
+    await router.use_replica()
+    await router._probe
+    return await router.use_replica()
+
+
+@pytest.mark.asyncio
+async def test_replica_used_while_lag_is_low():
+    router = ReplicaRouter(engine=None, max_lag=5, check_interval=60)
+    router._probe_lag = AsyncMock(return_value=0.5)
+
+    assert await probed(router) is True
+    assert await router.use_replica() is True
+    # Later calls are answered from the cached probe.
+    router._probe_lag.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_falls_back_to_primary():
+    router = ReplicaRouter(engine=None, max_lag=5, check_interval=60)
+    router._probe_lag = AsyncMock(return_value=30.0)
+
+    assert await probed(router) is False
+    assert router.lag == 30.0
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_falls_back_to_primary():
+    router = ReplicaRouter(engine=None, max_lag=5, check_interval=60)
+    router._probe_lag = AsyncMock(side_effect=OSError("connection refused"))
+
+    assert await probed(router) is False
+    assert router.lag is None
+
+
+@pytest.mark.asyncio
+async def test_requests_never_wait_on_a_slow_probe():
+    router = ReplicaRouter(engine=None, max_lag=5, check_interval=60, probe_timeout=0.05)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    router._probe_lag = hang
+
+    # Answered at once from the last (initial) state while the probe runs.
+    assert await asyncio.wait_for(router.use_replica(), 0.01) is False
+    await router._probe
+    assert router.lag is None
+    assert await router.use_replica() is False
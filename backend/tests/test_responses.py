@@ -0,0 +1,42 @@
+import json
+import uuid
+from datetime import date, datetime
+
+from asyncpg.pgproto.pgproto import UUID as PgUUID
+from fastapi.encoders import jsonable_encoder
+
+from src.responses import FastJSONResponse
+from src.schemas.aadhaar_schemas import AadhaarSendOtpResponse
+from src.schemas.udyam_schemas import GSTINStatus
+
+
+def test_model_renders_like_model_dump_json():
+    model = AadhaarSendOtpResponse(transactionId="t-1", otpSentTo="XXXX-XXXX-1234", appId="a-1")
+    response = FastJSONResponse(model)
+    assert response.body == model.model_dump_json().encode()
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_dict_matches_jsonable_encoder():
+    content = {
+        "items": [
+            {
+                "id": uuid.uuid4(),
+                "app_id": PgUUID(str(uuid.uuid4())),
+                "dob_or_doi": date(1990, 1, 31),
+                "created_at": datetime(2024, 5, 1, 10, 30, 15, 123456),
+                "has_gstin_status": GSTINStatus.NO,
+                "entrepreneur_name": "Asha Trāders",
+                "form_payload": {"nested": [1, 2.5, None]},
+            }
+        ],
+        "nextCursor": None,
+    }
+    body = FastJSONResponse(content).body
+    assert json.loads(body) == jsonable_encoder(content)
+
+
+def test_nested_models_and_non_string_keys():
+    model = AadhaarSendOtpResponse(transactionId="t-1", otpSentTo="x", appId="a-1")
+    body = FastJSONResponse({"result": model, 1: "one"}).body
+    assert json.loads(body) == {"result": model.model_dump(), "1": "one"}
@@ -0,0 +1,72 @@
+# tests/test_serve.py
+import signal
+import time
+
+import uvicorn
+
+from src.commands import serve
+from src.commands.serve import DrainingServer, cgroup_cpu_quota, default_workers, pool_sizes
+from src.lifecycle import DRAINING, READY, Lifecycle
+
+
+def test_pools_fit_the_connection_budget():
+    # Plenty of room: the configured sizes are kept.
+    assert pool_sizes(budget=100, workers=4, pool_size=10, max_overflow=10) == (10, 10)
+    # 90 connections over 8 workers: 11 each, pool first, overflow the rest.
+    assert pool_sizes(budget=90, workers=8, pool_size=10, max_overflow=10) == (10, 1)
+    assert pool_sizes(budget=40, workers=8, pool_size=10, max_overflow=10) == (5, 0)
+
+
+def test_every_worker_gets_at_least_one_connection():
+    assert pool_sizes(budget=3, workers=8, pool_size=10, max_overflow=10) == (1, 0)
+
+
+def test_default_workers_is_positive():
+    assert default_workers() >= 1
+
+
+def test_cgroup_cpu_quota(tmp_path):
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == 2.0
+
+    # cgroup v2 takes precedence.
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) is None
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert cgroup_cpu_quota(str(tmp_path)) == 1.5
+
+
+def test_default_workers_honours_the_cpu_quota(monkeypatch):
+    monkeypatch.setattr(serve.os, "sched_getaffinity", lambda pid: set(range(16)))
+    monkeypatch.setattr(serve, "cgroup_cpu_quota", lambda: 1.5)
+    assert default_workers() == 2
+    monkeypatch.setattr(serve, "cgroup_cpu_quota", lambda: 0.25)
+    assert default_workers() == 1
+    monkeypatch.setattr(serve, "cgroup_cpu_quota", lambda: None)
+    assert default_workers() == 16
+
+
+def test_sigterm_reports_not_ready_before_exiting():
+    lifecycle = Lifecycle()
+    lifecycle.state = READY
+    server = DrainingServer(uvicorn.Config("src:app"), lifecycle, prestop_delay=0.1)
+
+    server.handle_exit(signal.SIGTERM, None)
+    assert lifecycle.state == DRAINING
+    assert not server.should_exit
+
+    time.sleep(0.3)
+    assert server.should_exit
+
+
+def test_second_sigterm_exits_at_once():
+    server = DrainingServer(uvicorn.Config("src:app"), Lifecycle(), prestop_delay=60)
+    server.handle_exit(signal.SIGTERM, None)
+    server.handle_exit(signal.SIGTERM, None)
+    assert server.should_exit
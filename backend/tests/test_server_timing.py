@@ -0,0 +1,79 @@
+# tests/test_server_timing.py
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from src.telemetry.histogram import Histogram
+from src.telemetry.timing import (
+    PHASES,
+    ServerTimingMiddleware,
+    TimedAPIRoute,
+    TimingHistograms,
+    current_timings,
+    note_checkout,
+)
+
+
+@pytest.fixture()
+def timed_client():
+    router = APIRouter(route_class=TimedAPIRoute)
+
+    @router.get("/items/{item_id}")
+    async def read_item(item_id: int, q: str = "x"):
+        note_checkout(2_000_000)
+        current_timings().statements.extend([1_000_000, 3_000_000])
+        return {"item_id": item_id, "q": q}
+
+    @router.get("/sync")
+    def read_sync():
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.state.histograms = TimingHistograms()
+    app.add_middleware(ServerTimingMiddleware, histograms=app.state.histograms)
+    return TestClient(app)
+
+
+def parse(header):
+    return {
+        part.split(";")[0].strip(): float(part.split("dur=")[1])
+        for part in header.split(",")
+    }
+
+
+def test_server_timing_header_lists_phases_and_statements(timed_client):
+    response = timed_client.get("/items/3?q=y")
+
+    assert response.json() == {"item_id": 3, "q": "y"}
+    timing = parse(response.headers["server-timing"])
+    assert set(PHASES) <= timing.keys()
+    assert timing["db_checkout"] == 2.0
+    assert timing["sql"] == 4.0
+    assert timing["sql-1"] == 1.0 and timing["sql-2"] == 3.0
+    assert timing["total"] >= timing["routing"]
+
+
+def test_timed_route_keeps_validation_and_sync_endpoints(timed_client):
+    assert timed_client.get("/items/abc").status_code == 422
+    assert timed_client.get("/sync").json() == {"ok": True}
+
+
+def test_histograms_keyed_by_route_template(timed_client):
+    timed_client.get("/items/1")
+    timed_client.get("/items/2")
+
+    summary = timed_client.app.state.histograms.summary()
+    assert summary["/items/{item_id}"]["total"]["count"] == 2
+    assert summary["/items/{item_id}"]["sql"]["sum_ms"] == 8.0
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = Histogram(bounds=(1, 10, 100))
+    for value in (0.5, 0.7, 5, 50, 500):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.4) == 1
+    assert histogram.quantile(0.6) == 10
+    assert histogram.quantile(1.0) == float("inf")
+    assert histogram.cumulative()[-1] == (float("inf"), 5)
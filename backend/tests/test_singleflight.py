@@ -0,0 +1,94 @@
+# tests/test_singleflight.py
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from src.singleflight import SingleFlight, SingleFlightMiddleware
+
+
+def make_app():
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.fail = False
+    flights = SingleFlight()
+
+    @app.post("/api/v1/pan/verify")
+    async def verify(payload: dict):
+        app.state.calls += 1
+        await asyncio.sleep(0.05)
+        if app.state.fail:
+            app.state.fail = False
+            raise RuntimeError("boom")
+        return {"call": app.state.calls, **payload}
+
+    @app.post("/api/v1/udyam/{app_id}/submit")
+    async def submit(app_id: str):
+        app.state.calls += 1
+        await asyncio.sleep(0.05)
+        raise HTTPException(status_code=409, detail="Application is not ready for submit")
+
+    app.add_middleware(SingleFlightMiddleware, flights=flights)
+    return app, flights
+
+
+def client_for(app):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://localhost")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_execution():
+    app, flights = make_app()
+    async with client_for(app) as client:
+        first, second = await asyncio.gather(
+            client.post("/api/v1/pan/verify", json={"appId": "a1"}),
+            client.post("/api/v1/pan/verify", json={"appId": "a1"}),
+        )
+
+    assert app.state.calls == 1
+    assert first.json() == second.json() == {"call": 1, "appId": "a1"}
+    assert [r.headers.get("coalesced") for r in (first, second)] == [None, "true"]
+    assert flights.coalesced == 1
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_too():
+    app, _ = make_app()
+    async with client_for(app) as client:
+        responses = await asyncio.gather(
+            *(client.post("/api/v1/udyam/a1/submit", json={}) for _ in range(3))
+        )
+
+    assert app.state.calls == 1
+    assert [r.status_code for r in responses] == [409, 409, 409]
+
+
+@pytest.mark.asyncio
+async def test_different_payloads_and_later_requests_run_separately():
+    app, _ = make_app()
+    async with client_for(app) as client:
+        await asyncio.gather(
+            client.post("/api/v1/pan/verify", json={"appId": "a1"}),
+            client.post("/api/v1/pan/verify", json={"appId": "a2"}),
+        )
+        await client.post("/api/v1/pan/verify", json={"appId": "a1"})
+
+    assert app.state.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_duplicate_runs_itself_when_the_first_execution_fails():
+    app, _ = make_app()
+    app.state.fail = True
+    async with client_for(app) as client:
+        first, second = await asyncio.gather(
+            client.post("/api/v1/pan/verify", json={"appId": "a1"}),
+            client.post("/api/v1/pan/verify", json={"appId": "a1"}),
+        )
+
+    assert first.status_code == 500
+    assert second.status_code == 200
+    assert app.state.calls == 2
@@ -0,0 +1,50 @@
+import gzip
+import json
+
+import brotli
+
+from src.compression import choose_encoding
+from src.static_assets import IMMUTABLE, REVALIDATE, static_assets
+
+
+def test_choose_encoding():
+    assert choose_encoding(None) is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("br;q=0, gzip") == "gzip"
+    assert choose_encoding("br;q=0.5, gzip;q=0.8") == "gzip"
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("gzip", available=()) is None
+
+
+def test_form_schema_variants_and_etag(test_client):
+    asset = static_assets.get("udyam-form")
+    assert json.loads(gzip.decompress(asset.variants["gzip"])) == json.loads(asset.body)
+    assert brotli.decompress(asset.variants["br"]) == asset.body
+
+    response = test_client.get("/api/v1/schemas/udyam-form.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f'"{asset.version}-gzip"'
+    assert response.headers["cache-control"] == REVALIDATE
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json()["steps"][0]["step"] == 1
+
+    # An ETag from any encoding identifies the same version.
+    revalidated = test_client.get(
+        "/api/v1/schemas/udyam-form.json",
+        headers={"Accept-Encoding": "br", "If-None-Match": response.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == f'"{asset.version}-br"'
+
+
+def test_versioned_url_is_immutable(test_client):
+    version = static_assets.get("openapi").version
+    response = test_client.get(f"/api/v1/openapi.json?v={version}")
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert "/api/v1/schemas/udyam-form.json" in response.json()["paths"]
+
+    stale = test_client.get("/api/v1/openapi.json?v=0000000000000000")
+    assert stale.headers["cache-control"] == REVALIDATE
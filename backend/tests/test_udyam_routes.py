@@ -3,6 +3,7 @@ import json
 import uuid
 from unittest.mock import AsyncMock
 from fastapi import status
+from src.cache.app_state import InvalidTransitionError
 
 BASE_URL = "/api/v1/udyam"
 
@@ -50,3 +51,200 @@ def test_submit_final_form_not_found(test_client, monkeypatch, final_form_payloa
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json() == {"detail": "Application not found"}
+
+
+def test_list_attempts_route(test_client):
+    routes = [route.path for route in test_client.app.routes]
+    assert f"{BASE_URL}/applications/{{app_id}}/attempts" in routes
+
+
+def test_list_attempts_success(test_client, monkeypatch):
+    app_id = str(uuid.uuid4())
+    mock_response = {
+        "items": [
+            {
+                "id": str(uuid.uuid4()),
+                "kind": "pan",
+                "success": True,
+                "message": "PAN verified (simulated)",
+                "createdAt": "2025-08-14T09:41:41",
+            }
+        ],
+        "nextCursor": "abc",
+    }
+
+    mock_service = AsyncMock()
+    mock_service.list_attempts.return_value = mock_response
+
+    monkeypatch.setattr("src.routes.udyam_routes.AttemptService", lambda: mock_service)
+
+    response = test_client.get(f"{BASE_URL}/applications/{app_id}/attempts?limit=1")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == mock_response
+    assert mock_service.list_attempts.await_args.args[1:3] == (1, None)
+
+
+def test_list_attempts_invalid_cursor(test_client):
+    app_id = str(uuid.uuid4())
+
+    response = test_client.get(f"{BASE_URL}/applications/{app_id}/attempts?cursor=not-a-cursor")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_list_attempts_not_found(test_client, monkeypatch):
+    app_id = str(uuid.uuid4())
+
+    mock_service = AsyncMock()
+    mock_service.list_attempts.side_effect = ValueError("Application not found")
+
+    monkeypatch.setattr("src.routes.udyam_routes.AttemptService", lambda: mock_service)
+
+    response = test_client.get(f"{BASE_URL}/applications/{app_id}/attempts")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Application not found"}
+
+
+def test_submit_final_form_invalid_transition(test_client, monkeypatch, final_form_payload):
+    app_id = str(uuid.uuid4())
+
+    mock_service = AsyncMock()
+    mock_service.submit_registration.side_effect = InvalidTransitionError("Application is already submitted")
+
+    monkeypatch.setattr("src.routes.udyam_routes.UdyamService", lambda: mock_service)
+
+    response = test_client.post(f"{BASE_URL}/{app_id}/submit", json=final_form_payload)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {"detail": "Application is already submitted"}
+
+
+def test_list_applications_success(test_client, monkeypatch, admin_headers):
+    mock_response = {
+        "items": [{"id": str(uuid.uuid4()), "status": "submitted"}],
+        "nextCursor": None,
+    }
+
+    mock_service = AsyncMock()
+    mock_service.list_applications.return_value = mock_response
+
+    monkeypatch.setattr("src.routes.udyam_routes.UdyamService", lambda: mock_service)
+
+    response = test_client.get(
+        f"{BASE_URL}/applications?status=submitted&fields=id,status&pan_verified=true", headers=admin_headers
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == mock_response
+    kwargs = mock_service.list_applications.await_args.kwargs
+    assert kwargs["fields"] == ("id", "status")
+    assert kwargs["status"] == "submitted"
+    assert kwargs["pan_verified"] is True
+
+
+def test_list_applications_unknown_field(test_client, admin_headers):
+    response = test_client.get(f"{BASE_URL}/applications?fields=id,aadhaar_hash", headers=admin_headers)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"detail": "Unknown fields: aadhaar_hash"}
+
+
+def test_list_applications_requires_admin_key(test_client, admin_headers):
+    response = test_client.get(f"{BASE_URL}/applications")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = test_client.get(f"{BASE_URL}/applications", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_list_applications_disabled_without_admin_key(test_client):
+    response = test_client.get(f"{BASE_URL}/applications")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_list_applications_accepts_aware_timestamps(test_client, admin_headers):
+    response = test_client.get(
+        f"{BASE_URL}/applications",
+        params={"created_from": "2020-01-01T00:00:00Z", "created_to": "2100-01-01T05:30:00+05:30"},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_export_applications_streams_file(test_client, monkeypatch, admin_headers):
+    calls = {}
+
+    async def fake_export(session_maker, format, compress=False, **filters):
+        calls.update(format=format, compress=compress, **filters)
+        yield b'{"id": "1"}\n'
+        yield b'{"id": "2"}\n'
+
+    monkeypatch.setattr("src.routes.udyam_routes.export_bytes", fake_export)
+
+    response = test_client.get(f"{BASE_URL}/applications/export?format=ndjson&status=submitted", headers=admin_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"].startswith('attachment; filename="udyam_applications_')
+    assert response.content == b'{"id": "1"}\n{"id": "2"}\n'
+    assert calls["format"] == "ndjson" and calls["compress"] is False and calls["status"] == "submitted"
+
+
+def test_export_applications_empty_status_exports_all(test_client, monkeypatch, admin_headers):
+    calls = {}
+
+    async def fake_export(session_maker, format, compress=False, **filters):
+        calls.update(filters)
+        yield b""
+
+    monkeypatch.setattr("src.routes.udyam_routes.export_bytes", fake_export)
+
+    response = test_client.get(f"{BASE_URL}/applications/export?status=", headers=admin_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert calls["status"] is None
+
+
+def test_export_applications_requires_admin_key(test_client, admin_headers):
+    response = test_client.get(f"{BASE_URL}/applications/export")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_export_applications_rejects_unknown_format(test_client, admin_headers):
+    response = test_client.get(f"{BASE_URL}/applications/export?format=xlsx", headers=admin_headers)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_import_applications_returns_report(test_client, monkeypatch, admin_headers):
+    received = []
+
+    class FakeImport:
+        async def ingest(self, lines):
+            async for line in lines:
+                received.append(line)
+            return {"received": 2, "inserted": 1, "failed": 1, "errors": [{"line": 2, "error": "bad"}]}
+
+    monkeypatch.setattr("src.routes.udyam_routes.ImportService", FakeImport)
+
+    response = test_client.post(
+        f"{BASE_URL}/applications/import",
+        content=b'{"a": 1}\n{"b": 2}\n',
+        headers={"Content-Type": "application/x-ndjson", **admin_headers},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["errors"] == [{"line": 2, "error": "bad"}]
+    assert received == [b'{"a": 1}', b'{"b": 2}']
+
+
+def test_import_applications_requires_admin_key(test_client, admin_headers):
+    response = test_client.post(f"{BASE_URL}/applications/import", content=b'{"a": 1}\n')
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED